@@ -1,18 +1,33 @@
 #!/usr/bin/env python3
 """Network Hunt CLI - Discover talented makers from Product Hunt."""
 
+import atexit
 import click
+import logging
+import logging.handlers
+import queue
 import subprocess
 import sys
 
-from .db import supabase
-from .workers import APIWorker, PostScraperWorker, ProfileScraperWorker
+# Heavy modules (supabase, gql, playwright) are imported inside each command,
+# so `--help` and unrelated commands don't pay for them at startup.
 
 
 @click.group()
-def cli():
+@click.option("-v", "--verbose", count=True, help="Show per-item progress (-v)")
+def cli(verbose: int):
     """Network Hunt - Discover and track talented makers from Product Hunt."""
-    pass
+    # Records are written to stderr by a listener thread, so concurrent
+    # workers and coroutines never block on the stream lock
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stderr))
+    listener.start()
+    atexit.register(listener.stop)
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(message)s",
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+    )
 
 
 # ========== Crawl Commands ==========
@@ -30,6 +45,8 @@ def crawl():
 @click.option("-l", "--limit", type=int, default=0, help="Maximum tasks to process (0=unlimited)")
 def crawl_api(mode: str, days: int, schedule_only: bool, limit: int):
     """Crawl Product Hunt API for posts."""
+    from .workers import APIWorker
+
     if mode == "backfill":
         APIWorker.schedule_backfill(days)
     else:
@@ -41,16 +58,36 @@ def crawl_api(mode: str, days: int, schedule_only: bool, limit: int):
 
 @crawl.command("posts")
 @click.option("-l", "--limit", type=int, default=0, help="Maximum tasks to process (0=unlimited)")
-def crawl_posts(limit: int):
+@click.option("-c", "--concurrency", type=int, default=1, help="Browsers scraping in parallel")
+@click.option("-w", "--watch", is_flag=True,
+              help="Keep running and pick up new tasks as they are queued (one browser, no limit)")
+def crawl_posts(limit: int, concurrency: int, watch: bool):
     """Scrape post pages for makers."""
-    PostScraperWorker().run(limit if limit > 0 else 100000)
+    from .workers import PostScraperWorker
+
+    if watch:
+        if limit or concurrency != 1:
+            raise click.UsageError("--watch runs a single browser with no limit; drop --limit/--concurrency")
+        PostScraperWorker().watch()
+    else:
+        PostScraperWorker().run(limit if limit > 0 else 100000, concurrency)
 
 
 @crawl.command("profiles")
 @click.option("-l", "--limit", type=int, default=0, help="Maximum tasks to process (0=unlimited)")
-def crawl_profiles(limit: int):
+@click.option("-c", "--concurrency", type=int, default=1, help="Browsers scraping in parallel")
+@click.option("-w", "--watch", is_flag=True,
+              help="Keep running and pick up new tasks as they are queued (one browser, no limit)")
+def crawl_profiles(limit: int, concurrency: int, watch: bool):
     """Scrape user profiles."""
-    ProfileScraperWorker().run(limit if limit > 0 else 100000)
+    from .workers import ProfileScraperWorker
+
+    if watch:
+        if limit or concurrency != 1:
+            raise click.UsageError("--watch runs a single browser with no limit; drop --limit/--concurrency")
+        ProfileScraperWorker().watch()
+    else:
+        ProfileScraperWorker().run(limit if limit > 0 else 100000, concurrency)
 
 
 @crawl.command("all")
@@ -59,6 +96,8 @@ def crawl_profiles(limit: int):
 @click.option("-l", "--limit", type=int, default=0, help="Maximum tasks per stage (0=unlimited)")
 def crawl_all(mode: str, days: int, limit: int):
     """Run all crawl stages in sequence."""
+    from .workers import APIWorker, PostScraperWorker, ProfileScraperWorker
+
     effective_limit = limit if limit > 0 else 100000
 
     click.echo("=== Stage 1: API ===")
@@ -83,6 +122,8 @@ def crawl_all(mode: str, days: int, limit: int):
 @click.option("-l", "--limit", type=int, default=0, help="Maximum tasks per worker (0=unlimited)")
 def crawl_parallel(mode: str, days: int, limit: int):
     """Run all crawl stages in parallel as independent processes."""
+    from .workers import APIWorker
+
     # Schedule API tasks first
     if mode == "backfill":
         APIWorker.schedule_backfill(days)
@@ -115,8 +156,8 @@ def crawl_parallel(mode: str, days: int, limit: int):
     for name, proc in processes:
         stdout, stderr = proc.communicate()
         if proc.returncode == 0:
-            # Extract last line with completion info
-            lines = stdout.strip().split('\n')
+            # Extract last line with completion info (workers log to stderr)
+            lines = stderr.strip().split('\n')
             summary = lines[-1] if lines else "done"
             click.echo(f"  [{name}] completed: {summary}")
         else:
@@ -134,10 +175,14 @@ def crawl_parallel(mode: str, days: int, limit: int):
 @click.option("--cleanup", is_flag=True, help="Reset stale processing tasks")
 def tasks(retry_failed: bool, cleanup: bool):
     """Show task queue status."""
+    from .db import supabase
+    from .workers import APIWorker, PostScraperWorker, ProfileScraperWorker
+
     if retry_failed:
         result = supabase.table("ph_tasks").update({
             "status": "pending",
-            "error": None
+            "error": None,
+            "error_class": None
         }).eq("status", "failed").execute()
         click.echo(f"Reset {len(result.data or [])} failed tasks to pending")
         return
@@ -161,10 +206,13 @@ def tasks(retry_failed: bool, cleanup: bool):
 @cli.command()
 def stats():
     """Show database statistics."""
+    from .db import supabase
+    from .workers import APIWorker, PostScraperWorker, ProfileScraperWorker
+
     # Supabase counts
-    posts = supabase.table("ph_posts").select("id", count="exact").execute()
-    post_people = supabase.table("ph_post_people").select("id", count="exact").execute()
-    profiles = supabase.table("ph_profiles").select("username", count="exact").execute()
+    posts = supabase.table("ph_posts").select("id", count="exact", head=True).execute()
+    post_people = supabase.table("ph_post_people").select("id", count="exact", head=True).execute()
+    profiles = supabase.table("ph_profiles").select("username", count="exact", head=True).execute()
 
     click.echo("\nDatabase Statistics (Supabase)\n")
     click.echo(f"  Posts:          {posts.count or 0}")
@@ -190,14 +238,13 @@ def stats():
 
     # Top profiles
     top_profiles = supabase.table("ph_profiles").select(
-        "username, name, followers_count, links"
+        "username, name, followers_count, link_count"
     ).order("followers_count", desc=True).limit(5).execute()
 
     if top_profiles.data:
         click.echo("\nTop Profiles by Followers:\n")
         for p in top_profiles.data:
-            links = p.get("links") or []
-            link_count = len(links)
+            link_count = p.get("link_count") or 0
             link_str = f" [{link_count} links]" if link_count else ""
             click.echo(f"  {p['followers_count']:5d} - @{p['username']} ({p['name']}){link_str}")
 
@@ -209,6 +256,8 @@ def stats():
 @click.option("--tasks-only", is_flag=True, help="Only reset tasks, keep data")
 def reset(confirm: bool, tasks_only: bool):
     """Reset all crawl progress and data."""
+    from .db import supabase
+
     if not confirm:
         if tasks_only:
             click.echo("This will delete all tasks from ph_tasks.")
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 from pydantic import BaseModel
@@ -7,6 +8,9 @@ from pydantic import BaseModel
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
+# Local data directory (SQLite database, browser storage state)
+DATA_DIR = Path(__file__).parent.parent / "data"
+
 
 def require_env(name: str) -> str:
     value = os.getenv(name)
@@ -28,6 +32,7 @@ class ProductHuntConfig(BaseModel):
     token: str
     api_url: str = "https://api.producthunt.com/v2/api/graphql"
     requests_per_second: float = 1.0
+    scrape_requests_per_second: float = 1.0
 
 
 class SerpConfig(BaseModel):
@@ -53,6 +58,7 @@ class Config(BaseModel):
     arxiv: ArxivConfig
 
 
+@lru_cache(maxsize=1)
 def load_config() -> Config:
     return Config(
         supabase=SupabaseConfig(
@@ -70,6 +76,3 @@ def load_config() -> Config:
         ),
         arxiv=ArxivConfig(),
     )
-
-
-config = load_config()
@@ -1,56 +1,21 @@
+import asyncio
+import logging
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Literal
-from dataclasses import dataclass, asdict
+from operator import itemgetter
+from typing import Iterator, Literal
+import orjson
 from gql import gql, Client
-from gql.transport.httpx import HTTPXTransport
+from gql.transport.httpx import HTTPXAsyncTransport
 
-from ..config import config
+from ..config import load_config
 from ..db import supabase
-from ..scrapers.ph_profile import PHProfileScraper, PHProfile
-
-
-@dataclass
-class PHComment:
-    id: str
-    body: str | None
-    created_at: str | None
-    user_id: str | None
-    user_name: str | None
-    user_username: str | None
-
-
-@dataclass
-class PHProductLink:
-    type: str
-    url: str
-
-
-@dataclass
-class PHMedia:
-    type: str
-    url: str
-
-
-@dataclass
-class PHPost:
-    id: str
-    name: str
-    tagline: str | None
-    description: str | None
-    slug: str
-    url: str | None
-    website: str | None
-    votes_count: int
-    comments_count: int
-    reviews_rating: float | None
-    reviews_count: int
-    featured_at: str | None
-    created_at: str
-    topics: list[str]
-    product_links: list[PHProductLink]
-    media: list[PHMedia]
-    comments: list[PHComment]
+from ..scrapers.ph_profile import PHProfileScraper, PHProfile, profile_to_row
+
+log = logging.getLogger(__name__)
 
 
 GET_POSTS_QUERY = gql("""
@@ -105,14 +70,115 @@ GET_POSTS_QUERY = gql("""
 """)
 
 
+# Rows per Supabase upsert (one HTTPS round-trip per batch)
+UPSERT_BATCH_SIZE = 100
+# Profiles are slow to scrape, so flush more often to avoid losing work
+PROFILE_BATCH_SIZE = 25
+# Backfill pages between writes of the resume cursor
+CURSOR_FLUSH_EVERY = 10
+# Usernames fetched per get_unscraped_usernames RPC call
+UNSCRAPED_PAGE_SIZE = 1000
+# Concurrent day windows walked during a crawl (requests stay rate limited)
+DEFAULT_CONCURRENCY = 4
+# Browser threads used by scrape_posts / scrape_profiles
+DEFAULT_SCRAPE_WORKERS = 4
+
+
+class RateLimiter:
+    """Space out async calls so they never exceed `rate` requests per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+                now = self._next_at
+            self._next_at = now + self.interval
+
+
+class ThreadRateLimiter:
+    """Thread-safe RateLimiter for the browser worker pool."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+class BatchWriter:
+    """Background thread that saves queued items in batches.
+
+    Producers `put()` items and never wait on Supabase; `save(batch)` runs on
+    the writer thread. The first save error is re-raised when the block exits.
+    """
+
+    def __init__(self, save, batch_size: int):
+        self.save = save
+        self.batch_size = batch_size
+        self.error: Exception | None = None
+        self._queue: queue.Queue = queue.Queue(maxsize=batch_size * 2)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._queue.put(None)
+        self._thread.join()
+        if self.error and exc_type is None:
+            raise self.error
+
+    def put(self, item):
+        self._queue.put(item)
+
+    def _run(self):
+        batch = []
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        self._flush(batch)
+
+    def _flush(self, batch: list):
+        if not batch or self.error:
+            return
+        try:
+            self.save(batch)
+        except Exception as e:
+            log.error("  Batch save failed: %s", e)
+            self.error = e
+
+
 class ProductHuntCrawler:
-    def __init__(self):
-        transport = HTTPXTransport(
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, scrape_workers: int = DEFAULT_SCRAPE_WORKERS):
+        config = load_config()
+        transport = HTTPXAsyncTransport(
             url=config.product_hunt.api_url,
             headers={"Authorization": f"Bearer {config.product_hunt.token}"},
+            json_deserialize=orjson.loads,
+            http2=True,
         )
         self.client = Client(transport=transport, fetch_schema_from_transport=False)
-        self.request_delay = 1.0 / config.product_hunt.requests_per_second
+        self.concurrency = concurrency
+        self.scrape_workers = scrape_workers
 
     def get_source_state(self) -> dict | None:
         """Get crawl state from Supabase."""
@@ -123,8 +189,9 @@ class ProductHuntCrawler:
         """Update crawl state in Supabase."""
         supabase.table("data_source_state").update(updates).eq("source", "product_hunt").execute()
 
-    def fetch_posts(
+    async def fetch_posts(
         self,
+        session,
         posted_after: str | None = None,
         posted_before: str | None = None,
         after: str | None = None,
@@ -136,261 +203,352 @@ class ProductHuntCrawler:
             "after": after,
             "first": first,
         }
-        print(f"  Fetching posts: after={posted_after}, before={posted_before}")
-        result = self.client.execute(GET_POSTS_QUERY, variable_values=variables)
+        log.debug("  Fetching posts: after=%s, before=%s", posted_after, posted_before)
+        result = await session.execute(GET_POSTS_QUERY, variable_values=variables)
         return result
 
-    def parse_post(self, node: dict) -> PHPost:
-        topics = [edge["node"]["name"] for edge in node.get("topics", {}).get("edges", [])]
-
-        product_links = [
-            PHProductLink(type=pl["type"], url=pl["url"])
-            for pl in node.get("productLinks", []) or []
-        ]
-
-        media = [
-            PHMedia(type=m["type"], url=m["url"])
-            for m in node.get("media", []) or []
-        ]
-
-        # Comments 需要单独查询，这里先返回空（API 复杂度限制）
-        comments: list[PHComment] = []
-
-        return PHPost(
-            id=node["id"],
-            name=node["name"],
-            tagline=node.get("tagline"),
-            description=node.get("description"),
-            slug=node["slug"],
-            url=node.get("url"),
-            website=node.get("website"),
-            votes_count=node.get("votesCount", 0),
-            comments_count=node.get("commentsCount", 0),
-            reviews_rating=node.get("reviewsRating"),
-            reviews_count=node.get("reviewsCount", 0),
-            featured_at=node.get("featuredAt"),
-            created_at=node["createdAt"],
-            topics=topics,
-            product_links=product_links,
-            media=media,
-            comments=comments,
-        )
-
-    def save_post(self, post: PHPost):
-        """Save post to Supabase."""
-        data = {
-            "id": post.id,
-            "name": post.name,
-            "tagline": post.tagline,
-            "description": post.description,
-            "slug": post.slug,
-            "url": post.url,
-            "website_url": post.website,
-            "votes_count": post.votes_count,
-            "comments_count": post.comments_count,
-            "reviews_rating": post.reviews_rating,
-            "reviews_count": post.reviews_count,
-            "topics": post.topics,
-            "product_links": [{"type": pl.type, "url": pl.url} for pl in post.product_links],
-            "media": [{"type": m.type, "url": m.url} for m in post.media],
-            "featured_at": post.featured_at,
-            "created_at": post.created_at,
-        }
-        supabase.table("ph_posts").upsert(data, on_conflict="id").execute()
+    def parse_posts(self, edges: list[dict]) -> Iterator[dict]:
+        """Yield upsert-ready ph_posts rows straight from GraphQL edges."""
+        for edge in edges:
+            node = edge["node"]
+            yield {
+                "id": node["id"],
+                "name": node["name"],
+                "tagline": node.get("tagline"),
+                "description": node.get("description"),
+                "slug": node["slug"],
+                "url": node.get("url"),
+                "website_url": node.get("website"),
+                "votes_count": node.get("votesCount", 0),
+                "comments_count": node.get("commentsCount", 0),
+                "reviews_rating": node.get("reviewsRating"),
+                "reviews_count": node.get("reviewsCount", 0),
+                "topics": [t["node"]["name"] for t in node.get("topics", {}).get("edges", [])],
+                # productLinks / media already have the {type, url} column shape
+                "product_links": node.get("productLinks") or [],
+                "media": node.get("media") or [],
+                "featured_at": node.get("featuredAt"),
+                "created_at": node["createdAt"],
+            }
 
-    def crawl_backfill(self, days: int = 30, max_posts: int | None = None):
-        """Crawl historical data, going backwards from oldest_date."""
-        state = self.get_source_state()
-        if not state or state["status"] != "active":
-            print("Backfill crawl is not active")
+    def save_posts(self, rows: list[dict]):
+        """Save a batch of ph_posts rows to Supabase in a single upsert."""
+        if not rows:
             return
+        supabase.rpc("upsert_ph_posts", {"p": rows}).execute()
 
-        start_date = datetime.fromisoformat(state["oldest_date"]) if state["oldest_date"] else datetime.now()
-        end_date = start_date - timedelta(days=days)
+    async def _crawl_windows(
+        self,
+        windows: list[tuple[str, str, str | None]],
+        max_posts: int | None = None,
+        on_page=None,
+        on_window_done=None,
+    ) -> int:
+        """Walk (posted_after, posted_before, cursor) windows concurrently.
+
+        Each window is paginated by its own cursor walker; all walkers share one
+        rate limiter so the PH rate limit holds regardless of concurrency.
+        `on_page(index, cursor)` and `on_window_done(index)` may return a dict
+        of source-state updates, which are written in the order they were made.
+        """
+        limiter = RateLimiter(load_config().product_hunt.requests_per_second)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        state_lock = asyncio.Lock()
+        total_posts = 0
 
-        print(f"Backfill: {start_date.date()} -> {end_date.date()}")
+        async def save_state(updates: dict | None):
+            if updates:
+                async with state_lock:
+                    await asyncio.to_thread(self.update_source_state, **updates)
 
-        cursor = state.get("last_cursor")
-        current_date = start_date
-        total_posts = 0
+        async def walk(session, index: int, posted_after: str, posted_before: str, cursor: str | None):
+            nonlocal total_posts
+            async with semaphore:
+                while True:
+                    if max_posts and total_posts >= max_posts:
+                        return
 
-        while current_date > end_date:
-            if max_posts and total_posts >= max_posts:
-                break
+                    await limiter.wait()
+                    result = await self.fetch_posts(session, posted_after, posted_before, after=cursor)
 
-            day_before = current_date - timedelta(days=1)
+                    edges = result["posts"]["edges"]
+                    page_info = result["posts"]["pageInfo"]
 
-            try:
-                result = self.fetch_posts(
-                    posted_after=day_before.isoformat(),
-                    posted_before=current_date.isoformat(),
-                    after=cursor,
-                )
+                    posts = []
+                    for post in self.parse_posts(edges):
+                        if max_posts and total_posts >= max_posts:
+                            break
 
-                edges = result["posts"]["edges"]
-                page_info = result["posts"]["pageInfo"]
+                        posts.append(post)
 
-                for edge in edges:
-                    if max_posts and total_posts >= max_posts:
+                        total_posts += 1
+                        log.debug("[%d] %s (%d votes)", total_posts, post["name"], post["votes_count"])
+
+                    # One upsert per page instead of one per post
+                    await asyncio.to_thread(self.save_posts, posts)
+
+                    if page_info["hasNextPage"] and page_info["endCursor"]:
+                        cursor = page_info["endCursor"]
+                        if on_page:
+                            await save_state(on_page(index, cursor))
+                    else:
                         break
 
-                    post = self.parse_post(edge["node"])
-                    self.save_post(post)
+                if on_window_done:
+                    await save_state(on_window_done(index))
 
-                    total_posts += 1
-                    print(f"[{total_posts}] {post.name} ({post.votes_count} votes)")
+        async with self.client as session:
+            await asyncio.gather(*(
+                walk(session, i, posted_after, posted_before, cursor)
+                for i, (posted_after, posted_before, cursor) in enumerate(windows)
+            ))
 
-                if page_info["hasNextPage"] and page_info["endCursor"]:
-                    cursor = page_info["endCursor"]
-                    self.update_source_state(last_cursor=cursor)
-                else:
-                    cursor = None
-                    current_date = day_before
-                    self.update_source_state(
-                        oldest_date=current_date.date().isoformat(),
-                        last_cursor=None,
-                    )
-                    print(f"  Completed day, moving to {current_date.date()}")
+        return total_posts
 
-                time.sleep(self.request_delay)
+    async def crawl_backfill(self, days: int = 30, max_posts: int | None = None):
+        """Crawl historical data, going backwards from oldest_date."""
+        state = self.get_source_state()
+        if not state or state["status"] != "active":
+            log.warning("Backfill crawl is not active")
+            return
 
-            except Exception as e:
-                print(f"Error: {e}")
-                raise
+        start_date = datetime.fromisoformat(state["oldest_date"]) if state["oldest_date"] else datetime.now()
+        end_date = start_date - timedelta(days=days)
 
-        print(f"\nBackfill complete. Total posts: {total_posts}")
+        log.info("Backfill: %s -> %s", start_date.date(), end_date.date())
 
-    def crawl_incremental(self):
+        # One window per day, newest first; the first day resumes from the saved cursor
+        windows = []
+        current_date = start_date
+        while current_date > end_date:
+            day_before = current_date - timedelta(days=1)
+            windows.append((day_before.isoformat(), current_date.isoformat(), None))
+            current_date = day_before
+        if windows:
+            windows[0] = (windows[0][0], windows[0][1], state.get("last_cursor"))
+
+        # oldest_date only advances over a contiguous run of finished days,
+        # so an interrupted run never skips a day that was still in flight
+        done: set[int] = set()
+        frontier = 0
+
+        # The resume cursor is kept in memory and only written every few pages
+        pending_cursor = None
+        pages_since_flush = 0
+
+        def on_page(index: int, cursor: str) -> dict | None:
+            nonlocal pending_cursor, pages_since_flush
+            if index != frontier:
+                return None
+            pending_cursor = cursor
+            pages_since_flush += 1
+            if pages_since_flush < CURSOR_FLUSH_EVERY:
+                return None
+            pending_cursor = None
+            pages_since_flush = 0
+            return {"last_cursor": cursor}
+
+        def on_window_done(index: int) -> dict | None:
+            nonlocal frontier, pending_cursor, pages_since_flush
+            done.add(index)
+            if index != frontier:
+                return None
+            while frontier in done:
+                frontier += 1
+            pending_cursor = None
+            pages_since_flush = 0
+            oldest_date = start_date - timedelta(days=frontier)
+            log.info("  Completed day, moving to %s", oldest_date.date())
+            return {"oldest_date": oldest_date.date().isoformat(), "last_cursor": None}
+
+        try:
+            total_posts = await self._crawl_windows(windows, max_posts, on_page, on_window_done)
+        except Exception as e:
+            log.error("Error: %s", e)
+            raise
+        finally:
+            if pending_cursor:
+                self.update_source_state(last_cursor=pending_cursor)
+
+        log.info("Backfill complete. Total posts: %d", total_posts)
+
+    async def crawl_incremental(self):
         """Crawl new data from newest_date to today."""
         state = self.get_source_state()
         if not state or state["status"] != "active":
-            print("Incremental crawl is not active")
+            log.warning("Incremental crawl is not active")
             return
 
         last_date = datetime.fromisoformat(state["newest_date"]) if state["newest_date"] else datetime.now()
         today = datetime.now()
 
         if last_date.date() >= today.date():
-            print("Already up to date")
+            log.info("Already up to date")
             return
 
-        print(f"Incremental: {last_date.date()} -> {today.date()}")
+        log.info("Incremental: %s -> %s", last_date.date(), today.date())
 
-        cursor = None
-        total_posts = 0
-        has_more = True
+        windows = []
+        current_date = last_date
+        while current_date < today:
+            next_date = min(current_date + timedelta(days=1), today)
+            windows.append((current_date.isoformat(), next_date.isoformat(), None))
+            current_date = next_date
 
-        while has_more:
-            try:
-                result = self.fetch_posts(
-                    posted_after=last_date.isoformat(),
-                    posted_before=today.isoformat(),
-                    after=cursor,
-                )
-
-                edges = result["posts"]["edges"]
-                page_info = result["posts"]["pageInfo"]
-
-                for edge in edges:
-                    post = self.parse_post(edge["node"])
-                    self.save_post(post)
-
-                    total_posts += 1
-                    print(f"[{total_posts}] {post.name} ({post.votes_count} votes)")
-
-                if page_info["hasNextPage"] and page_info["endCursor"]:
-                    cursor = page_info["endCursor"]
-                else:
-                    has_more = False
-
-                time.sleep(self.request_delay)
-
-            except Exception as e:
-                print(f"Error: {e}")
-                raise
+        try:
+            total_posts = await self._crawl_windows(windows)
+        except Exception as e:
+            log.error("Error: %s", e)
+            raise
 
         self.update_source_state(
             newest_date=today.date().isoformat(),
             last_cursor=None,
         )
-        print(f"\nIncremental complete. Total new posts: {total_posts}")
+        log.info("Incremental complete. Total new posts: %d", total_posts)
 
     def crawl(self, mode: Literal["backfill", "incremental"], days: int = 7, max_posts: int | None = None):
         if mode == "backfill":
-            self.crawl_backfill(days=days, max_posts=max_posts)
+            asyncio.run(self.crawl_backfill(days=days, max_posts=max_posts))
         else:
-            self.crawl_incremental()
+            asyncio.run(self.crawl_incremental())
+
+    def _scrape_concurrently(self, items: list[str], scrape) -> Iterator[tuple[str, object, Exception | None]]:
+        """Run `scrape(scraper, items)` over a pool of browser threads.
+
+        Playwright's sync API is bound to the thread that started it, so each
+        worker thread owns one PHProfileScraper for its whole lifetime and pulls
+        items from a shared queue. `scrape` consumes the thread's items and
+        yields (item, result, error); those are yielded here as they finish.
+        """
+        limiter = ThreadRateLimiter(load_config().product_hunt.scrape_requests_per_second)
+        todo: queue.Queue[str] = queue.Queue()
+        for item in items:
+            todo.put(item)
+        results: queue.Queue = queue.Queue()
+        done = object()
+
+        def pending():
+            while True:
+                try:
+                    item = todo.get_nowait()
+                except queue.Empty:
+                    return
+                limiter.wait()
+                yield item
+
+        def worker():
+            try:
+                with PHProfileScraper() as scraper:
+                    for result in scrape(scraper, pending()):
+                        results.put(result)
+            except Exception as e:
+                log.error("  Scraper worker failed: %s", e)
+            finally:
+                results.put(done)
+
+        workers = max(1, min(self.scrape_workers, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in range(workers):
+                executor.submit(worker)
+
+            finished = 0
+            while finished < workers:
+                result = results.get()
+                if result is done:
+                    finished += 1
+                else:
+                    yield result
 
     def scrape_posts(self, slugs: list[str]):
         """Scrape usernames from post pages and save to Supabase."""
-        print(f"\nScraping {len(slugs)} posts for usernames...")
-        with PHProfileScraper() as scraper:
-            for i, slug in enumerate(slugs):
-                try:
-                    usernames = scraper.scrape_post_people(slug)
-                    for username in usernames:
-                        supabase.table("ph_post_people").upsert(
-                            {"post_slug": slug, "username": username},
-                            on_conflict="post_slug,username"
-                        ).execute()
-                    print(f"  [{i+1}/{len(slugs)}] {slug}: {len(usernames)} makers")
-                except Exception as e:
-                    print(f"  [{i+1}/{len(slugs)}] {slug}: error - {e}")
-
-    def get_unscraped_usernames(self) -> list[str]:
+        log.info("Scraping %d posts for usernames...", len(slugs))
+        results = self._scrape_concurrently(slugs, self._scrape_each_post)
+        with BatchWriter(self.save_post_people, UPSERT_BATCH_SIZE) as writer:
+            for i, (slug, usernames, error) in enumerate(results):
+                if error:
+                    log.warning("  [%d/%d] %s: error - %s", i + 1, len(slugs), slug, error)
+                    continue
+                for username in usernames:
+                    writer.put({"post_slug": slug, "username": username})
+                log.debug("  [%d/%d] %s: %d makers", i + 1, len(slugs), slug, len(usernames))
+
+    @staticmethod
+    def _scrape_each_post(
+        scraper: PHProfileScraper, slugs: Iterator[str],
+    ) -> Iterator[tuple[str, list[str] | None, Exception | None]]:
+        for slug in slugs:
+            try:
+                yield slug, scraper.scrape_post_people(slug), None
+            except Exception as e:
+                yield slug, None, e
+
+    def save_post_people(self, rows: list[dict]):
+        """Save a batch of post-person links to Supabase in a single upsert."""
+        if not rows:
+            return
+        supabase.rpc("upsert_ph_post_people", {"p": rows}).execute()
+
+    def get_unscraped_usernames(self, limit: int | None = None) -> list[str]:
         """Get usernames from ph_post_people that don't have profiles yet."""
-        # Get all usernames from ph_post_people
-        post_people = supabase.table("ph_post_people").select("username").execute()
-        all_usernames = set(row["username"] for row in post_people.data)
+        # The set difference runs in Postgres; pages are keyed on username
+        usernames: list[str] = []
+        after = ""
+        while limit is None or len(usernames) < limit:
+            page_size = UNSCRAPED_PAGE_SIZE if limit is None else min(UNSCRAPED_PAGE_SIZE, limit - len(usernames))
+            try:
+                result = supabase.rpc("get_unscraped_usernames", {
+                    "p_after": after,
+                    "p_limit": page_size,
+                }).execute()
+            except Exception as e:
+                if usernames:
+                    raise
+                log.warning("get_unscraped_usernames RPC failed (%s), diffing in Python", e)
+                unscraped = self._diff_unscraped_usernames()
+                return unscraped if limit is None else unscraped[:limit]
+            page = [row["username"] for row in result.data or []]
+            usernames.extend(page)
+            if len(page) < page_size:
+                break
+            after = page[-1]
+        return usernames
 
-        # Get usernames that already have profiles
+    def _diff_unscraped_usernames(self) -> list[str]:
+        """Python fallback for get_unscraped_usernames when the RPC is not deployed."""
         profiles = supabase.table("ph_profiles").select("username").execute()
-        scraped_usernames = set(row["username"] for row in profiles.data)
-
-        # Return unscraped
-        return list(all_usernames - scraped_usernames)
-
-    def save_profile(self, profile: PHProfile):
-        """Save profile to Supabase."""
-        data = {
-            "username": profile.username,
-            "name": profile.name,
-            "headline": profile.headline,
-            "bio": profile.bio,
-            "avatar_url": profile.avatar_url,
-            "links": profile.links if profile.links else None,
-            "followers_count": profile.followers_count,
-            "following_count": profile.following_count,
-            "hunted_count": profile.hunted_count,
-            "collections_count": profile.collections_count,
-            "reviews_count": profile.reviews_count,
-            "badges": profile.badges if profile.badges else None,
-            "following": profile.following if profile.following else None,
-            "hunted_posts": profile.hunted_posts if profile.hunted_posts else None,
-            "collections": [c.name if hasattr(c, "name") else c for c in profile.collections] if profile.collections else None,
-            "reviews": [
-                {"tool": r.tool_name, "product": r.product_name, "text": r.text} if hasattr(r, "tool_name") else r
-                for r in profile.reviews
-            ] if profile.reviews else None,
-        }
-        supabase.table("ph_profiles").upsert(data, on_conflict="username").execute()
+        scraped = frozenset(map(itemgetter("username"), profiles.data))
+
+        post_people = supabase.table("ph_post_people").select("username").execute()
+        # dict.fromkeys dedupes while keeping order, in a single pass
+        return list(dict.fromkeys(
+            row["username"] for row in post_people.data if row["username"] not in scraped
+        ))
+
+    def save_profiles(self, profiles: list[PHProfile]):
+        """Save a batch of profiles to Supabase in a single upsert."""
+        if not profiles:
+            return
+        rows = [profile_to_row(profile) for profile in profiles]
+        supabase.rpc("upsert_ph_profiles", {"p": rows}).execute()
 
     def scrape_profiles(self):
         """Scrape profiles for all usernames that don't have profiles yet."""
         usernames = self.get_unscraped_usernames()
         if not usernames:
-            print("No unscraped usernames found")
+            log.info("No unscraped usernames found")
             return
 
-        print(f"\nScraping {len(usernames)} profiles...")
-        with PHProfileScraper() as scraper:
-            for i, username in enumerate(usernames):
-                try:
-                    profile = scraper.scrape_full_profile(username)
-                    self.save_profile(profile)
-                    print(f"  [{i+1}/{len(usernames)}] @{username}: {profile.name}")
-                except Exception as e:
-                    print(f"  [{i+1}/{len(usernames)}] @{username}: error - {e}")
+        log.info("Scraping %d profiles...", len(usernames))
+        # Each thread also loads its next profile while scraping the current one
+        results = self._scrape_concurrently(usernames, lambda scraper, pending: scraper.scrape_full_profiles(pending))
+        with BatchWriter(self.save_profiles, PROFILE_BATCH_SIZE) as writer:
+            for i, (username, profile, error) in enumerate(results):
+                if error:
+                    log.warning("  [%d/%d] @%s: error - %s", i + 1, len(usernames), username, error)
+                    continue
+                writer.put(profile)
+                log.debug("  [%d/%d] @%s: %s", i + 1, len(usernames), username, profile.name)
 
 
 def crawl_producthunt(
@@ -398,8 +556,9 @@ def crawl_producthunt(
     days: int = 7,
     max_posts: int | None = None,
     scrape: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ):
-    crawler = ProductHuntCrawler()
+    crawler = ProductHuntCrawler(concurrency=concurrency)
     crawler.crawl(mode, days=days, max_posts=max_posts)
 
     if scrape:
@@ -1,5 +1,6 @@
-from supabase import create_client, Client
-from ..config import config
+import httpx
+from supabase import create_client, Client, ClientOptions
+from ..config import load_config
 
 _client: Client | None = None
 
@@ -7,8 +8,25 @@ _client: Client | None = None
 def get_supabase() -> Client:
     global _client
     if _client is None:
-        _client = create_client(config.supabase.url, config.supabase.secret_key)
+        config = load_config()
+        # One keep-alive HTTP/2 pool shared by every .execute() in the process.
+        # Scraper workers write only every few seconds, longer than httpx's 5s
+        # default idle expiry, so keep idle connections around for a minute
+        http_client = httpx.Client(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60),
+        )
+        _client = create_client(
+            config.supabase.url,
+            config.supabase.secret_key,
+            options=ClientOptions(httpx_client=http_client),
+        )
     return _client
 
 
-supabase = get_supabase()
+def __getattr__(name: str):
+    # `supabase` is built on first access so SQLite-only code paths never pay for it
+    if name == "supabase":
+        return get_supabase()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,164 +1,232 @@
 """Local SQLite database for work data (posts, knowledge, queue)."""
 
+import atexit
 import sqlite3
-import json
-from pathlib import Path
+import orjson
+import threading
 from contextlib import contextmanager
 from typing import Any
 
-# Data directory
-DATA_DIR = Path(__file__).parent.parent.parent / "data"
+from ..config import DATA_DIR
+
+
+def _dumps(value: Any) -> str:
+    """Serialize to JSON text; columns stay TEXT so JSON1 can still query them."""
+    return orjson.dumps(value).decode()
+
+
 DATA_DIR.mkdir(exist_ok=True)
 
 DB_PATH = DATA_DIR / "network_hunt.db"
 
+# WAL lets readers run alongside the writer and, with synchronous=NORMAL,
+# turns each commit into a WAL append instead of two fsyncs.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=30000",
+)
+
+
+def _configure(conn: sqlite3.Connection):
+    """Apply per-connection PRAGMAs."""
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+
+# One connection per thread, opened lazily and kept for the process lifetime
+_local = threading.local()
+_connections: list[sqlite3.Connection] = []
+_connections_lock = threading.Lock()
+
 
 def get_connection() -> sqlite3.Connection:
-    """Get SQLite connection with row factory."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Get this thread's SQLite connection (with row factory), opening it on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        # check_same_thread=False only so close_connections() can close it at exit
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=512)
+        conn.row_factory = sqlite3.Row
+        _configure(conn)
+        _local.conn = conn
+        with _connections_lock:
+            _connections.append(conn)
     return conn
 
 
 @contextmanager
 def get_db():
-    """Context manager for database connection."""
+    """Context manager for a transaction on this thread's connection."""
     conn = get_connection()
     try:
         yield conn
         conn.commit()
-    finally:
-        conn.close()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+@atexit.register
+def close_connections():
+    """Optimize and close every open connection."""
+    with _connections_lock:
+        for conn in _connections:
+            try:
+                conn.execute("PRAGMA optimize")
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _connections.clear()
+
+
+# Bump SCHEMA_VERSION (and add the migration to init_local_db) when SCHEMA changes
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+    -- 1. ph_posts - Product Hunt 产品
+    CREATE TABLE IF NOT EXISTS ph_posts (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        tagline TEXT,
+        description TEXT,
+        slug TEXT,
+        url TEXT,
+        website_url TEXT,
+        votes_count INTEGER DEFAULT 0,
+        comments_count INTEGER DEFAULT 0,
+        reviews_rating REAL,
+        reviews_count INTEGER DEFAULT 0,
+        topics TEXT,
+        product_links TEXT,
+        media TEXT,
+        featured_at TEXT,
+        created_at TEXT,
+        fetched_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_ph_posts_featured ON ph_posts(featured_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_ph_posts_votes ON ph_posts(votes_count DESC);
+
+    -- 2. ph_comments - Product Hunt 评论
+    CREATE TABLE IF NOT EXISTS ph_comments (
+        id TEXT PRIMARY KEY,
+        post_id TEXT NOT NULL,
+        body TEXT,
+        user_id TEXT,
+        user_name TEXT,
+        user_username TEXT,
+        created_at TEXT,
+        fetched_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_ph_comments_post ON ph_comments(post_id);
+
+    -- 3. person_posts - 人员-产品关联
+    CREATE TABLE IF NOT EXISTS person_posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        person_id TEXT NOT NULL,
+        post_id TEXT NOT NULL,
+        role TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(person_id, post_id, role)
+    );
+    -- (person_id, role, post_id) covers the maker lookups; it replaces the person_id-only index
+    DROP INDEX IF EXISTS idx_person_posts_person;
+    CREATE INDEX IF NOT EXISTS idx_person_posts_person_role ON person_posts(person_id, role, post_id);
+    CREATE INDEX IF NOT EXISTS idx_person_posts_post ON person_posts(post_id);
+
+    -- 3. person_knowledge - 搜索到的原始内容
+    CREATE TABLE IF NOT EXISTS person_knowledge (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        person_id TEXT NOT NULL,
+        source_type TEXT NOT NULL,
+        source_url TEXT,
+        source_query TEXT,
+        title TEXT,
+        content TEXT,
+        content_type TEXT,
+        content_date TEXT,
+        content_hash BLOB,
+        fetched_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(person_id, content_hash)
+    );
+    CREATE INDEX IF NOT EXISTS idx_person_knowledge_person ON person_knowledge(person_id);
+    CREATE INDEX IF NOT EXISTS idx_person_knowledge_source ON person_knowledge(source_type);
+
+    -- 4. enrichment_queue - 任务队列
+    CREATE TABLE IF NOT EXISTS enrichment_queue (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        person_id TEXT NOT NULL,
+        task_type TEXT NOT NULL,
+        priority INTEGER DEFAULT 0,
+        status TEXT DEFAULT 'pending',
+        attempts INTEGER DEFAULT 0,
+        max_attempts INTEGER DEFAULT 3,
+        last_error TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        processed_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_enrichment_queue_status ON enrichment_queue(status, priority DESC);
+
+    -- 5. ph_profiles - Product Hunt 用户 profiles
+    CREATE TABLE IF NOT EXISTS ph_profiles (
+        username TEXT PRIMARY KEY,
+        name TEXT,
+        bio TEXT,
+        avatar_url TEXT,
+        links TEXT,
+        followers_count INTEGER DEFAULT 0,
+        following_count INTEGER DEFAULT 0,
+        hunted_count INTEGER DEFAULT 0,
+        collections_count INTEGER DEFAULT 0,
+        reviews_count INTEGER DEFAULT 0,
+        badges TEXT,
+        following TEXT,
+        hunted_posts TEXT,
+        collections TEXT,
+        reviews TEXT,
+        fetched_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- 6. post_people - Post 和用户的关联
+    CREATE TABLE IF NOT EXISTS post_people (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_slug TEXT NOT NULL,
+        username TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(post_slug, username)
+    );
+    CREATE INDEX IF NOT EXISTS idx_post_people_post ON post_people(post_slug);
+    CREATE INDEX IF NOT EXISTS idx_post_people_user ON post_people(username);
+
+    -- 7. http_cache - 外部 API 响应缓存
+    CREATE TABLE IF NOT EXISTS http_cache (
+        key TEXT PRIMARY KEY,
+        etag TEXT,
+        body BLOB NOT NULL,
+        fetched_at REAL NOT NULL
+    );
+"""
 
 
 def init_local_db():
-    """Initialize local SQLite database with all tables."""
+    """Initialize local SQLite database with all tables (no-op once at SCHEMA_VERSION)."""
+    conn = get_connection()
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+
+    conn.executescript(SCHEMA)
     with get_db() as conn:
-        # 1. ph_posts - Product Hunt 产品
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS ph_posts (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                tagline TEXT,
-                description TEXT,
-                slug TEXT,
-                url TEXT,
-                website_url TEXT,
-                votes_count INTEGER DEFAULT 0,
-                comments_count INTEGER DEFAULT 0,
-                reviews_rating REAL,
-                reviews_count INTEGER DEFAULT 0,
-                topics TEXT,
-                product_links TEXT,
-                media TEXT,
-                featured_at TEXT,
-                created_at TEXT,
-                fetched_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_ph_posts_featured ON ph_posts(featured_at DESC)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_ph_posts_votes ON ph_posts(votes_count DESC)")
-
-        # 2. ph_comments - Product Hunt 评论
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS ph_comments (
-                id TEXT PRIMARY KEY,
-                post_id TEXT NOT NULL,
-                body TEXT,
-                user_id TEXT,
-                user_name TEXT,
-                user_username TEXT,
-                created_at TEXT,
-                fetched_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_ph_comments_post ON ph_comments(post_id)")
-
-        # 3. person_posts - 人员-产品关联
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS person_posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                person_id TEXT NOT NULL,
-                post_id TEXT NOT NULL,
-                role TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(person_id, post_id, role)
-            )
-        """)
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_person_posts_person ON person_posts(person_id)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_person_posts_post ON person_posts(post_id)")
-
-        # 3. person_knowledge - 搜索到的原始内容
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS person_knowledge (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                person_id TEXT NOT NULL,
-                source_type TEXT NOT NULL,
-                source_url TEXT,
-                source_query TEXT,
-                title TEXT,
-                content TEXT,
-                content_type TEXT,
-                content_date TEXT,
-                content_hash TEXT,
-                fetched_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(person_id, content_hash)
-            )
-        """)
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_person_knowledge_person ON person_knowledge(person_id)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_person_knowledge_source ON person_knowledge(source_type)")
-
-        # 4. enrichment_queue - 任务队列
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS enrichment_queue (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                person_id TEXT NOT NULL,
-                task_type TEXT NOT NULL,
-                priority INTEGER DEFAULT 0,
-                status TEXT DEFAULT 'pending',
-                attempts INTEGER DEFAULT 0,
-                max_attempts INTEGER DEFAULT 3,
-                last_error TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                processed_at TEXT
-            )
-        """)
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_enrichment_queue_status ON enrichment_queue(status, priority DESC)")
-
-        # 5. ph_profiles - Product Hunt 用户 profiles
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS ph_profiles (
-                username TEXT PRIMARY KEY,
-                name TEXT,
-                bio TEXT,
-                avatar_url TEXT,
-                links TEXT,
-                followers_count INTEGER DEFAULT 0,
-                following_count INTEGER DEFAULT 0,
-                hunted_count INTEGER DEFAULT 0,
-                collections_count INTEGER DEFAULT 0,
-                reviews_count INTEGER DEFAULT 0,
-                badges TEXT,
-                following TEXT,
-                hunted_posts TEXT,
-                collections TEXT,
-                reviews TEXT,
-                fetched_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # 6. post_people - Post 和用户的关联
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS post_people (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                post_slug TEXT NOT NULL,
-                username TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(post_slug, username)
-            )
-        """)
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_post_people_post ON post_people(post_slug)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_post_people_user ON post_people(username)")
+        # content_hash used to be a 64-char hex string; convert to the raw 32-byte digest
+        legacy = conn.execute(
+            "SELECT id, content_hash FROM person_knowledge WHERE typeof(content_hash) = 'text'"
+        ).fetchall()
+        conn.executemany(
+            "UPDATE OR IGNORE person_knowledge SET content_hash = ? WHERE id = ?",
+            [(bytes.fromhex(row['content_hash']), row['id']) for row in legacy],
+        )
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     print(f"Local database initialized: {DB_PATH}")
 
@@ -207,17 +275,67 @@ def upsert_post(
                 fetched_at = CURRENT_TIMESTAMP
         """, (id, name, tagline, description, slug, url, website_url,
               votes_count, comments_count, reviews_rating, reviews_count,
-              json.dumps(topics), json.dumps(product_links), json.dumps(media),
+              _dumps(topics), _dumps(product_links), _dumps(media),
               featured_at, created_at))
 
 
+def upsert_posts_bulk(items: list[dict]):
+    """Insert or update many posts with one statement.
+
+    Items use the ph_posts column names; the batch is passed as a single JSON
+    parameter and unpacked with json_each, so topics / product_links / media
+    stay nested JSON without per-row serialization.
+    """
+    if not items:
+        return
+    with get_db() as conn:
+        conn.execute("""
+            INSERT INTO ph_posts (id, name, tagline, description, slug, url, website_url,
+                                  votes_count, comments_count, reviews_rating, reviews_count,
+                                  topics, product_links, media, featured_at, created_at, fetched_at)
+            SELECT
+                json_extract(value, '$.id'),
+                json_extract(value, '$.name'),
+                json_extract(value, '$.tagline'),
+                json_extract(value, '$.description'),
+                json_extract(value, '$.slug'),
+                json_extract(value, '$.url'),
+                json_extract(value, '$.website_url'),
+                json_extract(value, '$.votes_count'),
+                json_extract(value, '$.comments_count'),
+                json_extract(value, '$.reviews_rating'),
+                json_extract(value, '$.reviews_count'),
+                json_extract(value, '$.topics'),
+                json_extract(value, '$.product_links'),
+                json_extract(value, '$.media'),
+                json_extract(value, '$.featured_at'),
+                json_extract(value, '$.created_at'),
+                CURRENT_TIMESTAMP
+            FROM json_each(?)
+            WHERE true  -- required so SQLite parses ON CONFLICT after a SELECT
+            ON CONFLICT(id) DO UPDATE SET
+                name = excluded.name,
+                tagline = excluded.tagline,
+                description = excluded.description,
+                url = excluded.url,
+                votes_count = excluded.votes_count,
+                comments_count = excluded.comments_count,
+                reviews_rating = excluded.reviews_rating,
+                reviews_count = excluded.reviews_count,
+                topics = excluded.topics,
+                product_links = excluded.product_links,
+                media = excluded.media,
+                fetched_at = CURRENT_TIMESTAMP
+        """, (_dumps(items),))
+
+
 def get_post(post_id: str) -> dict | None:
     """Get a post by ID."""
     with get_db() as conn:
         row = conn.execute("SELECT * FROM ph_posts WHERE id = ?", (post_id,)).fetchone()
         if row:
             result = dict(row)
-            result["topics"] = json.loads(result["topics"]) if result["topics"] else []
+            result["topics"] = orjson.loads(result["topics"]) if result["topics"] else []
             return result
         return None
 
@@ -238,7 +356,7 @@ def get_top_posts(limit: int = 10) -> list[dict]:
         results = []
         for row in rows:
             result = dict(row)
-            result["topics"] = json.loads(result["topics"]) if result["topics"] else []
+            result["topics"] = orjson.loads(result["topics"]) if result["topics"] else []
             results.append(result)
         return results
 
@@ -269,14 +387,40 @@ def upsert_comment(
         """, (id, post_id, body, user_id, user_name, user_username, created_at))
 
 
-def get_post_comments(post_id: str) -> list[dict]:
+def upsert_comments_bulk(items: list[dict]):
+    """Insert or update many comments with one json_each statement."""
+    if not items:
+        return
+    with get_db() as conn:
+        conn.execute("""
+            INSERT INTO ph_comments (id, post_id, body, user_id, user_name, user_username, created_at, fetched_at)
+            SELECT
+                json_extract(value, '$.id'),
+                json_extract(value, '$.post_id'),
+                json_extract(value, '$.body'),
+                json_extract(value, '$.user_id'),
+                json_extract(value, '$.user_name'),
+                json_extract(value, '$.user_username'),
+                json_extract(value, '$.created_at'),
+                CURRENT_TIMESTAMP
+            FROM json_each(?)
+            WHERE true
+            ON CONFLICT(id) DO UPDATE SET
+                body = excluded.body,
+                user_name = excluded.user_name,
+                user_username = excluded.user_username,
+                fetched_at = CURRENT_TIMESTAMP
+        """, (_dumps(items),))
+
+
+def get_post_comments(post_id: str) -> list[sqlite3.Row]:
     """Get comments for a post."""
     with get_db() as conn:
         rows = conn.execute(
             "SELECT * FROM ph_comments WHERE post_id = ? ORDER BY created_at ASC",
             (post_id,)
         ).fetchall()
-        return [dict(row) for row in rows]
+        return rows
 
 
 # ============================================
@@ -293,7 +437,7 @@ def upsert_person_post(person_id: str, post_id: str, role: str):
         """, (person_id, post_id, role))
 
 
-def get_person_posts(person_id: str) -> list[dict]:
+def get_person_posts(person_id: str) -> list[sqlite3.Row]:
     """Get all posts for a person."""
     with get_db() as conn:
         rows = conn.execute("""
@@ -302,7 +446,7 @@ def get_person_posts(person_id: str) -> list[dict]:
             LEFT JOIN ph_posts p ON pp.post_id = p.id
             WHERE pp.person_id = ?
         """, (person_id,)).fetchall()
-        return [dict(row) for row in rows]
+        return rows
 
 
 def get_person_posts_count(person_id: str) -> int:
@@ -326,15 +470,38 @@ def get_person_total_votes(person_id: str) -> int:
         return result[0] if result else 0
 
 
+def get_all_persons_post_stats() -> dict[str, tuple[int, int]]:
+    """Get {person_id: (maker posts count, total votes)} for all persons in one query."""
+    with get_db() as conn:
+        rows = conn.execute("""
+            SELECT pp.person_id, COUNT(*), COALESCE(SUM(p.votes_count), 0)
+            FROM person_posts pp
+            LEFT JOIN ph_posts p ON pp.post_id = p.id
+            WHERE pp.role = 'maker'
+            GROUP BY pp.person_id
+        """).fetchall()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+
 # ============================================
 # person_knowledge 操作
 # ============================================
 
+# Hot statements live in constants so every call hits the same cached statement
+SQL_INSERT_KNOWLEDGE = """
+    INSERT INTO person_knowledge
+    (person_id, source_type, source_url, source_query, title, content, content_type, content_date, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_INSERT_KNOWLEDGE_IGNORE = SQL_INSERT_KNOWLEDGE.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1)
+
+
 def insert_knowledge(
     person_id: str,
     source_type: str,
     content: str,
-    content_hash: str,
+    content_hash: bytes,
     source_url: str | None = None,
     source_query: str | None = None,
     title: str | None = None,
@@ -344,17 +511,27 @@ def insert_knowledge(
     """Insert knowledge item, returns True if inserted (not duplicate)."""
     with get_db() as conn:
         try:
-            conn.execute("""
-                INSERT INTO person_knowledge
-                (person_id, source_type, source_url, source_query, title, content, content_type, content_date, content_hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (person_id, source_type, source_url, source_query, title, content, content_type, content_date, content_hash))
+            conn.execute(SQL_INSERT_KNOWLEDGE, (
+                person_id, source_type, source_url, source_query, title, content, content_type, content_date, content_hash,
+            ))
             return True
         except sqlite3.IntegrityError:
             return False  # Duplicate
 
 
-def get_person_knowledge(person_id: str, source_type: str | None = None) -> list[dict]:
+def insert_knowledge_many(rows: list[tuple]) -> int:
+    """Insert knowledge items in one transaction, returns how many were new.
+
+    Each row is (person_id, source_type, source_url, source_query, title,
+    content, content_type, content_date, content_hash); duplicates are skipped.
+    """
+    with get_db() as conn:
+        before = conn.total_changes
+        conn.executemany(SQL_INSERT_KNOWLEDGE_IGNORE, rows)
+        return conn.total_changes - before
+
+
+def get_person_knowledge(person_id: str, source_type: str | None = None) -> list[sqlite3.Row]:
     """Get knowledge items for a person."""
     with get_db() as conn:
         if source_type:
@@ -367,7 +544,7 @@ def get_person_knowledge(person_id: str, source_type: str | None = None) -> list
                 "SELECT * FROM person_knowledge WHERE person_id = ? ORDER BY fetched_at DESC",
                 (person_id,)
             ).fetchall()
-        return [dict(row) for row in rows]
+        return rows
 
 
 def get_knowledge_count(person_id: str | None = None) -> int:
@@ -385,48 +562,92 @@ def get_knowledge_count(person_id: str | None = None) -> int:
 # enrichment_queue 操作
 # ============================================
 
+SQL_QUEUE_TASK = """
+    INSERT INTO enrichment_queue (person_id, task_type, priority)
+    VALUES (?, ?, ?)
+"""
+
+SQL_GET_PENDING_TASKS = """
+    SELECT * FROM enrichment_queue
+    WHERE status = 'pending'
+    ORDER BY priority DESC, created_at ASC
+    LIMIT ?
+"""
+
+SQL_CLAIM_PENDING_TASKS = """
+    UPDATE enrichment_queue
+    SET status = 'processing', attempts = attempts + 1
+    WHERE id IN (
+        SELECT id FROM enrichment_queue
+        WHERE status = 'pending'
+        ORDER BY priority DESC, created_at ASC
+        LIMIT ?
+    )
+    RETURNING *
+"""
+
+SQL_TASK_PROCESSING = """
+    UPDATE enrichment_queue
+    SET status = ?, attempts = attempts + 1
+    WHERE id = ?
+"""
+
+SQL_TASK_FINISHED = """
+    UPDATE enrichment_queue
+    SET status = ?, last_error = ?, processed_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+SQL_TASK_STATUS = """
+    UPDATE enrichment_queue
+    SET status = ?, last_error = ?
+    WHERE id = ?
+"""
+
+
 def queue_task(person_id: str, task_type: str, priority: int = 0):
     """Add a task to the queue."""
     with get_db() as conn:
-        conn.execute("""
-            INSERT INTO enrichment_queue (person_id, task_type, priority)
-            VALUES (?, ?, ?)
-        """, (person_id, task_type, priority))
+        conn.execute(SQL_QUEUE_TASK, (person_id, task_type, priority))
+
+
+def queue_tasks_many(rows: list[tuple[str, str, int]]):
+    """Add many (person_id, task_type, priority) tasks in one transaction."""
+    with get_db() as conn:
+        conn.executemany(SQL_QUEUE_TASK, rows)
 
 
 def get_pending_tasks(limit: int = 10) -> list[dict]:
     """Get pending tasks ordered by priority."""
     with get_db() as conn:
-        rows = conn.execute("""
-            SELECT * FROM enrichment_queue
-            WHERE status = 'pending'
-            ORDER BY priority DESC, created_at ASC
-            LIMIT ?
-        """, (limit,)).fetchall()
+        rows = conn.execute(SQL_GET_PENDING_TASKS, (limit,)).fetchall()
         return [dict(row) for row in rows]
 
 
+def claim_pending_tasks(limit: int = 10) -> list[dict]:
+    """Atomically mark up to `limit` pending tasks as processing and return them.
+
+    The returned rows already have `attempts` incremented.
+    """
+    with get_db() as conn:
+        # Take the write lock up front so concurrent workers never claim the same rows
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(SQL_CLAIM_PENDING_TASKS, (limit,)).fetchall()
+        tasks = [dict(row) for row in rows]
+    # RETURNING order is unspecified
+    tasks.sort(key=lambda t: (-t["priority"], t["created_at"]))
+    return tasks
+
+
 def update_task_status(task_id: int, status: str, error: str | None = None):
     """Update task status."""
     with get_db() as conn:
         if status == 'processing':
-            conn.execute("""
-                UPDATE enrichment_queue
-                SET status = ?, attempts = attempts + 1
-                WHERE id = ?
-            """, (status, task_id))
+            conn.execute(SQL_TASK_PROCESSING, (status, task_id))
         elif status in ('completed', 'failed'):
-            conn.execute("""
-                UPDATE enrichment_queue
-                SET status = ?, last_error = ?, processed_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (status, error, task_id))
+            conn.execute(SQL_TASK_FINISHED, (status, error, task_id))
         else:
-            conn.execute("""
-                UPDATE enrichment_queue
-                SET status = ?, last_error = ?
-                WHERE id = ?
-            """, (status, error, task_id))
+            conn.execute(SQL_TASK_STATUS, (status, error, task_id))
 
 
 def get_task(task_id: int) -> dict | None:
@@ -439,14 +660,11 @@ def get_task(task_id: int) -> dict | None:
 def get_queue_stats() -> dict:
     """Get queue statistics."""
     with get_db() as conn:
-        stats = {}
-        for status in ['pending', 'processing', 'completed', 'failed']:
-            count = conn.execute(
-                "SELECT COUNT(*) FROM enrichment_queue WHERE status = ?",
-                (status,)
-            ).fetchone()[0]
-            stats[status] = count
-        return stats
+        rows = conn.execute(
+            "SELECT status, COUNT(*) FROM enrichment_queue GROUP BY status"
+        ).fetchall()
+        counts = {row[0]: row[1] for row in rows}
+        return {status: counts.get(status, 0) for status in ['pending', 'processing', 'completed', 'failed']}
 
 
 # ============================================
@@ -495,14 +713,14 @@ def upsert_profile(
                 reviews = excluded.reviews,
                 fetched_at = CURRENT_TIMESTAMP
         """, (username, name, bio, avatar_url,
-              json.dumps(links) if links else None,
+              _dumps(links) if links else None,
               followers_count, following_count, hunted_count,
               collections_count, reviews_count,
-              json.dumps(badges) if badges else None,
-              json.dumps(following) if following else None,
-              json.dumps(hunted_posts) if hunted_posts else None,
-              json.dumps([c.name if hasattr(c, 'name') else c for c in collections]) if collections else None,
-              json.dumps([{'tool': r.tool_name, 'product': r.product_name, 'text': r.text} if hasattr(r, 'tool_name') else r for r in reviews]) if reviews else None))
+              _dumps(badges) if badges else None,
+              _dumps(following) if following else None,
+              _dumps(hunted_posts) if hunted_posts else None,
+              _dumps([c.name if hasattr(c, 'name') else c for c in collections]) if collections else None,
+              _dumps([{'tool': r.tool_name, 'product': r.product_name, 'text': r.text} if hasattr(r, 'tool_name') else r for r in reviews]) if reviews else None))
 
 
 def get_profile(username: str) -> dict | None:
@@ -513,7 +731,7 @@ def get_profile(username: str) -> dict | None:
             result = dict(row)
             for field in ['links', 'badges', 'following', 'hunted_posts', 'collections', 'reviews']:
                 if result.get(field):
-                    result[field] = json.loads(result[field])
+                    result[field] = orjson.loads(result[field])
             return result
         return None
 
@@ -561,5 +779,32 @@ def get_unscraped_usernames(limit: int = 100) -> list[str]:
         return [row['username'] for row in rows]
 
 
+# ============================================
+# http_cache 操作
+# ============================================
+
+def get_cached_response(key: str) -> sqlite3.Row | None:
+    """Get a cached response (etag, body, fetched_at) by key."""
+    with get_db() as conn:
+        return conn.execute(
+            "SELECT etag, body, fetched_at FROM http_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+
+def put_cached_response(key: str, etag: str | None, body: bytes, fetched_at: float):
+    """Insert or replace a cached response."""
+    with get_db() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO http_cache (key, etag, body, fetched_at) VALUES (?, ?, ?, ?)",
+            (key, etag, body, fetched_at),
+        )
+
+
+def touch_cached_response(key: str, fetched_at: float):
+    """Mark a cached response as fresh again (e.g. after a 304)."""
+    with get_db() as conn:
+        conn.execute("UPDATE http_cache SET fetched_at = ? WHERE key = ?", (fetched_at, key))
+
+
 # Initialize on import
 init_local_db()
@@ -82,6 +82,145 @@ CREATE TRIGGER update_persons_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- ============================================
+-- Product Hunt 表补充 (ph_* 表)
+-- ============================================
+
+-- links 数量由数据库计算，统计时不必下载整个 links JSON
+ALTER TABLE ph_profiles ADD COLUMN IF NOT EXISTS link_count INTEGER
+    GENERATED ALWAYS AS (COALESCE(jsonb_array_length(links), 0)) STORED;
+
+-- 任务失败时的异常类型单独一列，按类型统计/筛选不用 LIKE 扫 error 文本
+ALTER TABLE ph_tasks ADD COLUMN IF NOT EXISTS error_class TEXT;
+CREATE INDEX IF NOT EXISTS idx_ph_tasks_error_class ON ph_tasks(task_type, error_class)
+    WHERE error_class IS NOT NULL;
+
+-- ============================================
+-- RPC Functions (Product Hunt pipeline)
+-- ============================================
+
+-- 还没有 profile 的用户名 (按 username 分页: p_after 为上一页最后一个)
+CREATE OR REPLACE FUNCTION get_unscraped_usernames(p_after TEXT DEFAULT '', p_limit INTEGER DEFAULT 1000)
+RETURNS TABLE (username TEXT) AS $$
+    SELECT DISTINCT pp.username
+    FROM ph_post_people pp
+    LEFT JOIN ph_profiles p ON p.username = pp.username
+    WHERE p.username IS NULL AND pp.username > p_after
+    ORDER BY pp.username
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- 批量 upsert: 一次 RPC 传入 JSON 数组，服务端单条语句 + 单个事务完成
+CREATE OR REPLACE FUNCTION upsert_ph_posts(p JSONB)
+RETURNS VOID AS $$
+    INSERT INTO ph_posts (id, name, tagline, description, slug, url, website_url,
+                          votes_count, comments_count, reviews_rating, reviews_count,
+                          topics, product_links, media, featured_at, created_at)
+    SELECT id, name, tagline, description, slug, url, website_url,
+           votes_count, comments_count, reviews_rating, reviews_count,
+           topics, product_links, media, featured_at, created_at
+    FROM jsonb_populate_recordset(NULL::ph_posts, p)
+    ON CONFLICT (id) DO UPDATE SET
+        name = EXCLUDED.name,
+        tagline = EXCLUDED.tagline,
+        description = EXCLUDED.description,
+        slug = EXCLUDED.slug,
+        url = EXCLUDED.url,
+        website_url = EXCLUDED.website_url,
+        votes_count = EXCLUDED.votes_count,
+        comments_count = EXCLUDED.comments_count,
+        reviews_rating = EXCLUDED.reviews_rating,
+        reviews_count = EXCLUDED.reviews_count,
+        topics = EXCLUDED.topics,
+        product_links = EXCLUDED.product_links,
+        media = EXCLUDED.media,
+        featured_at = EXCLUDED.featured_at,
+        created_at = EXCLUDED.created_at,
+        fetched_at = NOW();
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION upsert_ph_profiles(p JSONB)
+RETURNS VOID AS $$
+    INSERT INTO ph_profiles (username, name, headline, bio, avatar_url, links,
+                             followers_count, following_count, hunted_count,
+                             collections_count, reviews_count, badges,
+                             following, hunted_posts, collections, reviews)
+    SELECT username, name, headline, bio, avatar_url, links,
+           followers_count, following_count, hunted_count,
+           collections_count, reviews_count, badges,
+           following, hunted_posts, collections, reviews
+    FROM jsonb_populate_recordset(NULL::ph_profiles, p)
+    ON CONFLICT (username) DO UPDATE SET
+        name = EXCLUDED.name,
+        headline = EXCLUDED.headline,
+        bio = EXCLUDED.bio,
+        avatar_url = EXCLUDED.avatar_url,
+        links = EXCLUDED.links,
+        followers_count = EXCLUDED.followers_count,
+        following_count = EXCLUDED.following_count,
+        hunted_count = EXCLUDED.hunted_count,
+        collections_count = EXCLUDED.collections_count,
+        reviews_count = EXCLUDED.reviews_count,
+        badges = EXCLUDED.badges,
+        following = EXCLUDED.following,
+        hunted_posts = EXCLUDED.hunted_posts,
+        collections = EXCLUDED.collections,
+        reviews = EXCLUDED.reviews;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION upsert_ph_post_people(p JSONB)
+RETURNS VOID AS $$
+    INSERT INTO ph_post_people (post_slug, username)
+    SELECT post_slug, username
+    FROM jsonb_populate_recordset(NULL::ph_post_people, p)
+    ON CONFLICT (post_slug, username) DO NOTHING;
+$$ LANGUAGE sql;
+
+-- 原子领取任务: 把最早的 p_limit 个 pending 任务标成 processing 并返回；
+-- SKIP LOCKED 让并发的 worker 各领各的，不会重复领取
+CREATE OR REPLACE FUNCTION claim_tasks(p_task_type TEXT, p_limit INTEGER)
+RETURNS SETOF ph_tasks AS $$
+    WITH claimed AS (
+        UPDATE ph_tasks SET status = 'processing', started_at = NOW()
+        WHERE id IN (
+            SELECT id FROM ph_tasks
+            WHERE task_type = p_task_type AND status = 'pending'
+            ORDER BY created_at
+            LIMIT p_limit
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    )
+    SELECT * FROM claimed ORDER BY created_at;
+$$ LANGUAGE sql;
+
+-- 批量更新任务状态: 每行 {id, status, ...}，只覆盖行里给出的字段；
+-- 重新排队/失败的任务清掉 started_at
+CREATE OR REPLACE FUNCTION update_ph_task_statuses(p JSONB)
+RETURNS VOID AS $$
+    UPDATE ph_tasks t SET
+        status = u.status,
+        attempts = COALESCE(u.attempts, t.attempts),
+        error = COALESCE(u.error, t.error),
+        error_class = COALESCE(u.error_class, t.error_class),
+        completed_at = COALESCE(u.completed_at, t.completed_at),
+        started_at = CASE WHEN u.status = 'completed' THEN t.started_at END
+    FROM jsonb_populate_recordset(NULL::ph_tasks, p) u
+    WHERE t.id = u.id;
+$$ LANGUAGE sql;
+
+-- 任务数按状态统计: {"pending": n, "completed": n, ...}，没有任务的状态不出现
+CREATE OR REPLACE FUNCTION get_task_stats(p_task_type TEXT)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_object_agg(status, n), '{}'::jsonb)
+    FROM (
+        SELECT status, count(*) AS n
+        FROM ph_tasks
+        WHERE task_type = p_task_type
+        GROUP BY status
+    ) s;
+$$ LANGUAGE sql STABLE;
+
 -- ============================================
 -- 初始化
 -- ============================================
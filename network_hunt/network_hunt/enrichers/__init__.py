@@ -1,10 +1,11 @@
-from .base import enrich_person, process_queue, queue_enrichment, queue_top_persons
+from .base import enrich_person, enrich_batch, process_queue, queue_enrichment, queue_top_persons
 from .serp import search_twitter, search_linkedin, search_general
 from .github import search_github
 from .arxiv import search_arxiv
 
 __all__ = [
     "enrich_person",
+    "enrich_batch",
     "process_queue",
     "queue_enrichment",
     "queue_top_persons",
@@ -0,0 +1,151 @@
+"""Shared event loop and HTTP client for the enrichers' async API calls.
+
+Handlers are called synchronously (from process_queue's worker threads), but an
+aiohttp.ClientSession is tied to one event loop. A single background loop owns
+the session so every thread shares one keep-alive connection pool.
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from typing import Any, Callable, Coroutine, TypeVar
+
+import aiohttp
+import orjson
+
+from ..db.local import get_cached_response, put_cached_response, touch_cached_response
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+MAX_RETRY_WAIT = 60.0
+
+_loop: asyncio.AbstractEventLoop | None = None
+_session: aiohttp.ClientSession | None = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop, starting it on first use."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="enrichers-aio", daemon=True).start()
+    return _loop
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Get the shared session (only use it from coroutines on get_loop())."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+    return _session
+
+
+def retry_after(response: aiohttp.ClientResponse) -> float | None:
+    """Seconds to wait before retrying a rate-limited response, or None if it isn't one."""
+    exhausted = response.status == 403 and response.headers.get("X-RateLimit-Remaining") == "0"
+    if response.status != 429 and not exhausted:
+        return None
+
+    if "Retry-After" in response.headers:
+        try:
+            return float(response.headers["Retry-After"])
+        except ValueError:
+            pass
+    if "X-RateLimit-Reset" in response.headers:
+        try:
+            return max(0.0, float(response.headers["X-RateLimit-Reset"]) - time.time())
+        except ValueError:
+            pass
+    return 0.0
+
+
+async def request_with_retry(
+    semaphore: asyncio.Semaphore,
+    url: str,
+    method: str = "GET",
+    **kwargs,
+) -> aiohttp.ClientResponse:
+    """Request `url` under `semaphore`, backing off and retrying when rate limited.
+
+    The body is read before returning, so `await response.read()` is free.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        async with semaphore:
+            async with get_session().request(method, url, **kwargs) as response:
+                await response.read()
+        wait = retry_after(response)
+        if wait is None or attempt == MAX_RETRIES:
+            return response
+        wait = min(max(wait, RETRY_BASE_DELAY * 2 ** attempt), MAX_RETRY_WAIT)
+        log.warning("    Rate limited (%d), retrying in %.0fs", response.status, wait)
+        await asyncio.sleep(wait)
+
+
+async def cached_request_json(
+    key: str,
+    ttl: float,
+    semaphore: asyncio.Semaphore,
+    url: str,
+    method: str = "GET",
+    headers: dict | None = None,
+    revalidate: bool = False,
+    validate: Callable[[Any], None] | None = None,
+    **kwargs,
+) -> Any:
+    """Request JSON through the on-disk response cache.
+
+    Responses younger than `ttl` seconds are served from the cache. With
+    `revalidate`, stale entries are re-requested with If-None-Match and a 304
+    reuses the cached body (GitHub doesn't count 304s against the rate limit).
+    `validate` is called on a fresh body before it is cached and can raise to
+    reject it (e.g. an error reported with HTTP 200).
+    """
+    # SQLite calls block, so keep them off the shared loop
+    cached = await asyncio.to_thread(get_cached_response, key)
+    now = time.time()
+    if cached and now - cached["fetched_at"] < ttl:
+        return orjson.loads(cached["body"])
+
+    headers = dict(headers or {})
+    if revalidate and cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+
+    response = await request_with_retry(semaphore, url, method, headers=headers, **kwargs)
+    if response.status == 304 and cached:
+        await asyncio.to_thread(touch_cached_response, key, now)
+        return orjson.loads(cached["body"])
+    response.raise_for_status()
+
+    body = await response.read()
+    data = orjson.loads(body)
+    if validate:
+        validate(data)
+    await asyncio.to_thread(put_cached_response, key, response.headers.get("ETag"), body, now)
+    return data
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the background loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+@atexit.register
+def close():
+    """Close the shared session and stop the loop."""
+    if _loop is None:
+        return
+    if _session is not None:
+        run(_session.close())
+    _loop.call_soon_threadsafe(_loop.stop)
@@ -1,25 +1,69 @@
-import time
-import xml.etree.ElementTree as ET
+import asyncio
+import logging
 import httpx
+from lxml import etree
 from datetime import datetime
 
-from ..config import config
+from ..config import load_config
 from .types import EnrichmentResult, KnowledgeItem, Person
 
 
+log = logging.getLogger(__name__)
+
+
+ATOM_URI = "http://www.w3.org/2005/Atom"
+ATOM_NS = f"{{{ATOM_URI}}}"  # Clark-notation prefix for plain tag comparisons
+ATOM_ENTRY = ATOM_NS + "entry"
+
 ARXIV_NS = {
-    "atom": "http://www.w3.org/2005/Atom",
+    "atom": ATOM_URI,
     "arxiv": "http://arxiv.org/schemas/atom",
 }
 
 
+def _xpath(expr: str) -> etree.XPath:
+    return etree.XPath(expr, namespaces=ARXIV_NS, smart_strings=False)
+
+
+ID_XP = _xpath("atom:id/text()")
+TITLE_XP = _xpath("atom:title/text()")
+SUMMARY_XP = _xpath("atom:summary/text()")
+PUBLISHED_XP = _xpath("atom:published/text()")
+AUTHORS_XP = _xpath("atom:author/atom:name/text()")
+CATEGORIES_XP = _xpath("atom:category/@term")
+HTML_LINK_XP = _xpath("atom:link[@type='text/html']/@href")
+LINK_XP = _xpath("atom:link/@href")
+
+
+def iter_entries(response: httpx.Response):
+    """Yield Atom <entry> elements as they arrive, freeing each once consumed."""
+    parser = etree.XMLPullParser(events=("end",), tag=ATOM_ENTRY)
+    for chunk in response.iter_bytes():
+        parser.feed(chunk)
+        for _, entry in parser.read_events():
+            yield entry
+            entry.clear()
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
+    parser.close()
+
+
 def normalize_author_name(name: str) -> str:
     """Convert 'John Doe' to 'john_doe' for arXiv search."""
     return name.lower().replace(" ", "_")
 
 
 def search_arxiv(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
-    """Search arXiv for papers by person."""
+    """Search arXiv for papers by person, spaced by the shared arXiv rate limiter."""
+    from .base import get_rate_limiter  # base imports this module
+
+    get_rate_limiter("arxiv").acquire()
+    return _search_arxiv(person, incremental, cutoff)
+
+
+def _search_arxiv(person: Person, incremental: bool, cutoff: str | None) -> EnrichmentResult:
+    """Search arXiv for papers by person (the caller handles rate limiting)."""
+    config = load_config()
     knowledge: list[KnowledgeItem] = []
 
     try:
@@ -33,82 +77,77 @@ def search_arxiv(person: Person, incremental: bool = False, cutoff: str | None =
             "max_results": "20",
         }
 
-        print(f"    arXiv: {search_query}")
-        response = httpx.get(config.arxiv.api_url, params=params, timeout=30)
-        response.raise_for_status()
-
-        # Parse XML
-        root = ET.fromstring(response.text)
+        log.debug("    arXiv: %s", search_query)
 
         cutoff_dt = None
         if incremental and cutoff:
             cutoff_dt = datetime.fromisoformat(cutoff.replace("Z", "+00:00"))
 
-        for entry in root.findall("atom:entry", ARXIV_NS):
-            # Parse entry
-            paper_id = entry.find("atom:id", ARXIV_NS)
-            title = entry.find("atom:title", ARXIV_NS)
-            summary = entry.find("atom:summary", ARXIV_NS)
-            published = entry.find("atom:published", ARXIV_NS)
-
-            if paper_id is None or title is None:
-                continue
-
-            # Get authors
-            authors = [
-                author.find("atom:name", ARXIV_NS).text
-                for author in entry.findall("atom:author", ARXIV_NS)
-                if author.find("atom:name", ARXIV_NS) is not None
-            ]
-
-            # Get categories
-            categories = [
-                cat.get("term", "")
-                for cat in entry.findall("atom:category", ARXIV_NS)
-            ]
-
-            # Get link
-            link_elem = entry.find("atom:link[@type='text/html']", ARXIV_NS)
-            if link_elem is None:
-                link_elem = entry.find("atom:link", ARXIV_NS)
-            link = link_elem.get("href") if link_elem is not None else paper_id.text
-
-            published_date = published.text if published is not None else None
-
-            # Skip if before cutoff
-            if cutoff_dt and published_date:
-                paper_date = datetime.fromisoformat(published_date.replace("Z", "+00:00"))
-                if paper_date < cutoff_dt:
+        name_lc = person.name.lower()
+        fromisoformat = datetime.fromisoformat
+
+        # Stream the feed instead of building the whole document
+        with httpx.stream("GET", config.arxiv.api_url, params=params, timeout=30) as response:
+            response.raise_for_status()
+
+            for entry in iter_entries(response):
+                # Parse entry
+                paper_id = ID_XP(entry)
+                title = TITLE_XP(entry)
+                summary = SUMMARY_XP(entry)
+                published = PUBLISHED_XP(entry)
+
+                if not paper_id or not title:
+                    continue
+
+                authors = AUTHORS_XP(entry)
+                categories = CATEGORIES_XP(entry)
+
+                # Get link
+                links = HTML_LINK_XP(entry) or LINK_XP(entry)
+                link = links[0] if links else paper_id[0]
+
+                published_date = published[0] if published else None
+
+                # Everything after this is older, so stop at the cutoff
+                if cutoff_dt and published_date:
+                    paper_date = fromisoformat(published_date.replace("Z", "+00:00"))
+                    if paper_date < cutoff_dt:
+                        break
+
+                # Verify author name matches
+                author_match = any(
+                    name_lc in author or author in name_lc
+                    for author in map(str.lower, authors)
+                )
+                if not author_match:
                     continue
 
-            # Verify author name matches
-            author_match = any(
-                person.name.lower() in author.lower() or author.lower() in person.name.lower()
-                for author in authors
-            )
-            if not author_match:
-                continue
-
-            # Build content
-            summary_text = summary.text.strip()[:500] if summary is not None else ""
-            content = f"{summary_text}... | Authors: {', '.join(authors)} | Categories: {', '.join(categories)}"
-
-            knowledge.append(KnowledgeItem(
-                source_type="arxiv",
-                source_url=link,
-                source_query=search_query,
-                title=title.text.strip().replace("\n", " ") if title.text else None,
-                content=content,
-                content_type="paper",
-                content_date=published_date,
-            ))
-
-        # Respect rate limit
-        time.sleep(config.arxiv.delay_seconds)
-
-        print(f"    arXiv: {len(knowledge)} papers")
+                # Build content
+                summary_text = summary[0].strip()[:500] if summary else ""
+                content = f"{summary_text}... | Authors: {', '.join(authors)} | Categories: {', '.join(categories)}"
+
+                knowledge.append(KnowledgeItem(
+                    source_type="arxiv",
+                    source_url=link,
+                    source_query=search_query,
+                    title=title[0].strip().replace("\n", " "),
+                    content=content,
+                    content_type="paper",
+                    content_date=published_date,
+                ))
+
+        log.info("    arXiv: %d papers", len(knowledge))
         return EnrichmentResult(success=True, knowledge=knowledge, contacts=[])
 
     except Exception as e:
-        print(f"    arXiv search failed: {e}")
+        log.warning("    arXiv search failed: %s", e)
         return EnrichmentResult(success=False, error=str(e))
+
+
+async def search_arxiv_async(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
+    """Search arXiv for papers by person (async; the blocking request runs in a thread).
+
+    run_source already waited on the arXiv rate limiter, so this skips it.
+    """
+    return await asyncio.to_thread(_search_arxiv, person, incremental, cutoff)
@@ -1,23 +1,81 @@
+import asyncio
 import hashlib
+import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
-from ..db import supabase
-from ..db.local import insert_knowledge, get_pending_tasks, update_task_status, queue_task
+from .. import db
+from ..config import load_config
+from ..db.local import insert_knowledge_many, claim_pending_tasks, update_task_status, queue_task, queue_tasks_many
+from .aio import run
 from .types import EnrichmentResult, KnowledgeItem, ContactItem, Person, TaskType
-from .serp import search_twitter, search_linkedin, search_general
-from .github import search_github
-from .arxiv import search_arxiv
+from .serp import search_twitter_async, search_linkedin_async, search_general_async
+from .github import search_github_async
+from .arxiv import search_arxiv_async
 
 
+log = logging.getLogger(__name__)
+
+
+# Async handlers; they all run on the shared loop in .aio
 TASK_HANDLERS = {
-    "twitter": search_twitter,
-    "linkedin": search_linkedin,
-    "github": search_github,
-    "arxiv": search_arxiv,
-    "general": search_general,
+    "twitter": search_twitter_async,
+    "linkedin": search_linkedin_async,
+    "github": search_github_async,
+    "arxiv": search_arxiv_async,
+    "general": search_general_async,
 }
 
+DEFAULT_QUEUE_WORKERS = 4
+
+# People enriched at once by enrich_batch
+DEFAULT_BATCH_CONCURRENCY = 20
+
+# Minimum spacing between requests to a source without its own delay setting
+DEFAULT_SOURCE_DELAY = 1.0
+
+
+class RateLimiter:
+    """Keeps calls at least `delay` seconds apart on the monotonic clock.
+
+    Time already spent on the previous request counts toward the spacing,
+    so a slow call is followed immediately by the next one.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def _reserve(self) -> float:
+        """Claim the next slot and return how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.delay
+        return start_at - now
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(task_type: str) -> RateLimiter:
+    """Get the shared limiter for a source."""
+    delay = load_config().arxiv.delay_seconds if task_type == "arxiv" else DEFAULT_SOURCE_DELAY
+    return RateLimiter(delay)
+
+
 # Map task type to cutoff column name
 CUTOFF_COLUMNS = {
     "twitter": "twitter_cutoff",
@@ -28,14 +86,51 @@ CUTOFF_COLUMNS = {
 }
 
 
-def hash_content(content: str) -> str:
-    """Generate SHA256 hash of content."""
-    return hashlib.sha256(content.encode()).hexdigest()
+def hash_content(content: str) -> bytes:
+    """Generate raw SHA256 digest of content (32 bytes, stored as a BLOB)."""
+    return hashlib.sha256(content.encode()).digest()
+
+
+# Recently fetched persons, so repeat tasks for one person skip the Supabase round-trip
+PERSON_CACHE_TTL = 300.0
+PERSON_CACHE_SIZE = 1024
+_person_cache: dict[str, tuple[float, Person]] = {}
+_person_cache_lock = threading.Lock()
 
 
 def get_person(person_id: str) -> Person | None:
+    """Get person by ID, served from a short-lived cache when possible."""
+    now = time.monotonic()
+    with _person_cache_lock:
+        cached = _person_cache.get(person_id)
+    if cached and now - cached[0] < PERSON_CACHE_TTL:
+        return cached[1]
+
+    person = fetch_person(person_id)
+    if person:
+        with _person_cache_lock:
+            if person_id not in _person_cache and len(_person_cache) >= PERSON_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del _person_cache[next(iter(_person_cache))]
+            _person_cache[person_id] = (now, person)
+    return person
+
+
+def invalidate_person(person_id: str):
+    """Drop a cached person after its Supabase row changes."""
+    with _person_cache_lock:
+        _person_cache.pop(person_id, None)
+
+
+def update_person(person_id: str, updates: dict):
+    """Write column updates to a person's Supabase row."""
+    db.supabase.table("persons").update(updates).eq("id", person_id).execute()
+    invalidate_person(person_id)
+
+
+def fetch_person(person_id: str) -> Person | None:
     """Get person by ID from Supabase."""
-    result = supabase.table("persons").select("*").eq("id", person_id).single().execute()
+    result = db.supabase.table("persons").select("*").eq("id", person_id).single().execute()
 
     if not result.data:
         return None
@@ -61,29 +156,47 @@ def get_person(person_id: str) -> Person | None:
 
 def save_knowledge(person_id: str, items: list[KnowledgeItem]) -> int:
     """Save knowledge items to local SQLite."""
-    saved = 0
+    rows = [
+        (
+            person_id, item.source_type, item.source_url, item.source_query, item.title,
+            item.content, item.content_type, item.content_date,
+            hash_content(f"{item.source_type}:{item.source_url}:{item.content}"),
+        )
+        for item in items
+    ]
+    return insert_knowledge_many(rows) if rows else 0
 
+
+CONFIDENCE_RANK = {"low": 0, "medium": 1, "high": 2}
+
+
+def dedupe_contacts(contacts: list[ContactItem]) -> list[ContactItem]:
+    """Drop repeated (type, value) contacts, keeping the most confident copy."""
+    best: dict[tuple[str, str], ContactItem] = {}
+    for contact in contacts:
+        key = (contact.contact_type, contact.contact_value.lower())
+        seen = best.get(key)
+        if seen is None or CONFIDENCE_RANK[contact.confidence] > CONFIDENCE_RANK[seen.confidence]:
+            best[key] = contact
+    return list(best.values())
+
+
+def dedupe_knowledge(items: list[KnowledgeItem]) -> list[KnowledgeItem]:
+    """Drop repeated (source_url, title) items; items without a URL are all kept."""
+    seen: set[tuple[str, str | None]] = set()
+    unique = []
     for item in items:
-        content_hash = hash_content(f"{item.source_type}:{item.source_url}:{item.content}")
-
-        if insert_knowledge(
-            person_id=person_id,
-            source_type=item.source_type,
-            content=item.content,
-            content_hash=content_hash,
-            source_url=item.source_url,
-            source_query=item.source_query,
-            title=item.title,
-            content_type=item.content_type,
-            content_date=item.content_date,
-        ):
-            saved += 1
-
-    return saved
-
-
-def update_person_from_contacts(person_id: str, contacts: list[ContactItem]):
-    """Update person record in Supabase with high-confidence contacts."""
+        if item.source_url:
+            key = (item.source_url, item.title)
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append(item)
+    return unique
+
+
+def build_contact_updates(contacts: list[ContactItem]) -> dict:
+    """Build persons column updates from high-confidence contacts."""
     updates = {}
 
     for contact in contacts:
@@ -101,23 +214,22 @@ def update_person_from_contacts(person_id: str, contacts: list[ContactItem]):
         elif contact.contact_type == "website":
             updates["website"] = contact.contact_value
 
-    if updates:
-        supabase.table("persons").update(updates).eq("id", person_id).execute()
+    return updates
 
 
 def get_cutoff_for_task(person: Person, task_type: str) -> str | None:
     """Get the appropriate cutoff date for a task type."""
-    if task_type == "twitter":
-        return person.twitter_cutoff
-    elif task_type == "linkedin":
-        return person.linkedin_cutoff
-    elif task_type == "github":
-        return person.github_cutoff
-    elif task_type == "arxiv":
-        return person.arxiv_cutoff
-    elif task_type == "general":
-        return person.serp_cutoff
-    return None
+    # CUTOFF_COLUMNS values double as Person attribute names
+    column = CUTOFF_COLUMNS.get(task_type)
+    return getattr(person, column) if column else None
+
+
+async def run_source(person: Person, task_type: str, incremental: bool) -> EnrichmentResult:
+    """Run one source for a person once its rate limiter allows."""
+    # Use per-channel cutoff for incremental mode
+    task_cutoff = get_cutoff_for_task(person, task_type) if incremental else None
+    await get_rate_limiter(task_type).acquire_async()
+    return await TASK_HANDLERS[task_type](person, incremental, task_cutoff)
 
 
 def enrich_person(
@@ -126,61 +238,94 @@ def enrich_person(
     incremental: bool = False,
 ) -> dict:
     """Enrich a person with data from various sources."""
+    return run(enrich_person_async(person_id, task_types, incremental))
+
+
+async def enrich_person_async(
+    person_id: str,
+    task_types: list[TaskType] | None = None,
+    incremental: bool = False,
+) -> dict:
+    """Enrich a person with data from various sources, querying the sources concurrently."""
     if task_types is None:
         task_types = ["full"]
 
-    person = get_person(person_id)
+    # Supabase and SQLite calls are blocking, so keep them off the event loop
+    person = await asyncio.to_thread(get_person, person_id)
     if not person:
         return {"success": False, "knowledge": 0, "contacts": 0}
 
-    print(f"\nEnriching: {person.name}")
-    print(f"  Tasks: {task_types}, Incremental: {incremental}")
+    log.info("Enriching: %s", person.name)
+    log.debug("  Tasks: %s, Incremental: %s", task_types, incremental)
 
     all_knowledge: list[KnowledgeItem] = []
     all_contacts: list[ContactItem] = []
 
     # Determine which tasks to run
-    tasks_to_run = list(TASK_HANDLERS.keys()) if "full" in task_types else [t for t in task_types if t != "full"]
+    tasks_to_run = list(TASK_HANDLERS.keys()) if "full" in task_types else [t for t in task_types if t in TASK_HANDLERS]
 
     cutoff_updates = {}
     now = datetime.now().isoformat()
 
-    for task_type in tasks_to_run:
-        handler = TASK_HANDLERS.get(task_type)
-        if not handler:
+    results = await asyncio.gather(
+        *(run_source(person, task_type, incremental) for task_type in tasks_to_run),
+        return_exceptions=True,
+    )
+
+    for task_type, result in zip(tasks_to_run, results):
+        if isinstance(result, Exception):
+            log.warning("    %s error: %s", task_type, result)
             continue
 
-        try:
-            # Use per-channel cutoff for incremental mode
-            task_cutoff = get_cutoff_for_task(person, task_type) if incremental else None
-            result = handler(person, incremental, task_cutoff)
+        if result.success:
+            all_knowledge.extend(result.knowledge)
+            all_contacts.extend(result.contacts)
+            # Update cutoff for this channel
+            cutoff_col = CUTOFF_COLUMNS.get(task_type)
+            if cutoff_col:
+                cutoff_updates[cutoff_col] = now
 
-            if result.success:
-                all_knowledge.extend(result.knowledge)
-                all_contacts.extend(result.contacts)
-                # Update cutoff for this channel
-                cutoff_col = CUTOFF_COLUMNS.get(task_type)
-                if cutoff_col:
-                    cutoff_updates[cutoff_col] = now
+    # Sources overlap (e.g. a Twitter handle from both GitHub and SERP)
+    all_knowledge = dedupe_knowledge(all_knowledge)
+    all_contacts = dedupe_contacts(all_contacts)
 
-        except Exception as e:
-            print(f"    {task_type} error: {e}")
+    # Save results to local SQLite
+    knowledge_count = await asyncio.to_thread(save_knowledge, person_id, all_knowledge)
 
-        time.sleep(1)  # Rate limiting between sources
+    # Update person with high-confidence contacts and per-channel cutoffs in one PATCH
+    updates = {**build_contact_updates(all_contacts), **cutoff_updates}
+    if updates:
+        await asyncio.to_thread(update_person, person_id, updates)
 
-    # Save results to local SQLite
-    knowledge_count = save_knowledge(person_id, all_knowledge)
+    log.info("  Done: %d knowledge, %d contacts", knowledge_count, len(all_contacts))
 
-    # Update person with high-confidence contacts in Supabase
-    update_person_from_contacts(person_id, all_contacts)
+    return {"success": True, "knowledge": knowledge_count, "contacts": len(all_contacts)}
 
-    # Update per-channel cutoffs in Supabase
-    if cutoff_updates:
-        supabase.table("persons").update(cutoff_updates).eq("id", person_id).execute()
 
-    print(f"  Done: {knowledge_count} knowledge, {len(all_contacts)} contacts")
+def enrich_batch(
+    person_ids: list[str],
+    task_types: list[TaskType] | None = None,
+    incremental: bool = False,
+    max_concurrent: int = DEFAULT_BATCH_CONCURRENCY,
+) -> list[dict]:
+    """Enrich many people at once; per-source limits still apply across the batch."""
+    return run(enrich_batch_async(person_ids, task_types, incremental, max_concurrent))
 
-    return {"success": True, "knowledge": knowledge_count, "contacts": len(all_contacts)}
+
+async def enrich_batch_async(
+    person_ids: list[str],
+    task_types: list[TaskType] | None = None,
+    incremental: bool = False,
+    max_concurrent: int = DEFAULT_BATCH_CONCURRENCY,
+) -> list[dict]:
+    """Enrich many people at once (async; must run on the shared loop in .aio)."""
+    sem = asyncio.Semaphore(max_concurrent)
+
+    async def enrich_one(person_id: str) -> dict:
+        async with sem:
+            return await enrich_person_async(person_id, task_types, incremental)
+
+    return await asyncio.gather(*(enrich_one(person_id) for person_id in person_ids))
 
 
 def queue_enrichment(
@@ -194,42 +339,65 @@ def queue_enrichment(
 
 def queue_top_persons(min_score: int = 50, limit: int = 100) -> int:
     """Queue top persons by importance score for enrichment."""
-    result = supabase.table("persons").select("id, importance_score").gte(
+    result = db.supabase.table("persons").select("id, importance_score").gte(
         "importance_score", min_score
     ).order("importance_score", desc=True).limit(limit).execute()
 
-    queued = 0
-    for person in result.data or []:
-        queue_task(person["id"], "full", priority=person["importance_score"])
-        queued += 1
+    rows = [(person["id"], "full", person["importance_score"]) for person in result.data or []]
+    queue_tasks_many(rows)
+    queued = len(rows)
 
-    print(f"Queued {queued} persons for enrichment")
+    log.info("Queued %d persons for enrichment", queued)
     return queued
 
 
-def process_queue(limit: int = 10):
-    """Process pending enrichment tasks from local SQLite."""
-    tasks = get_pending_tasks(limit)
-    print(f"Processing {len(tasks)} enrichment tasks")
-
-    for task in tasks:
-        # Mark as processing
-        update_task_status(task["id"], "processing")
-
-        try:
-            result = enrich_person(task["person_id"], [task["task_type"]], incremental=False)
-
-            if result["success"]:
-                update_task_status(task["id"], "completed")
-            else:
-                raise Exception("Enrichment failed")
-
-        except Exception as e:
-            error_msg = str(e)
-
-            if task["attempts"] + 1 >= task["max_attempts"]:
-                update_task_status(task["id"], "failed", error_msg)
-            else:
-                update_task_status(task["id"], "pending", error_msg)
-
-        time.sleep(2)  # Rate limiting between tasks
+def process_task(task: dict):
+    """Run one claimed enrichment task and record its outcome."""
+    try:
+        result = enrich_person(task["person_id"], [task["task_type"]], incremental=False)
+
+        if result["success"]:
+            update_task_status(task["id"], "completed")
+        else:
+            raise Exception("Enrichment failed")
+
+    except Exception as e:
+        error_msg = str(e)
+
+        # attempts was already incremented when the task was claimed
+        if task["attempts"] >= task["max_attempts"]:
+            update_task_status(task["id"], "failed", error_msg)
+        else:
+            update_task_status(task["id"], "pending", error_msg)
+
+
+def process_queue(limit: int = 10, workers: int = DEFAULT_QUEUE_WORKERS):
+    """Process pending enrichment tasks from local SQLite on a pool of worker threads.
+
+    Each thread claims one task at a time, so an interrupted run leaves at most
+    one task per thread in 'processing' (the local queue never resets them).
+    """
+    claimed = 0
+    claimed_lock = threading.Lock()
+
+    def work() -> int:
+        nonlocal claimed
+        processed = 0
+        while True:
+            with claimed_lock:
+                if claimed >= limit:
+                    return processed
+                claimed += 1
+            tasks = claim_pending_tasks(1)
+            if not tasks:
+                return processed
+            process_task(tasks[0])
+            processed += 1
+
+    log.info("Processing up to %d enrichment tasks", limit)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # sum() surfaces any unexpected exception from a worker
+        processed = sum(pool.map(lambda _: work(), range(min(workers, limit))))
+
+    log.info("Processed %d enrichment tasks", processed)
@@ -1,46 +1,184 @@
-import httpx
-from datetime import datetime
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timezone
+import aiohttp
+import ijson
+import orjson
 
-from ..config import config
+from ..config import load_config
+from ..db.local import get_cached_response, touch_cached_response
+from .aio import cached_request_json, get_session, run
 from .types import EnrichmentResult, KnowledgeItem, ContactItem, Person
 
 
-def github_get(endpoint: str) -> dict | list:
-    """Make a GitHub API request."""
-    headers = {
+log = logging.getLogger(__name__)
+
+
+# Cap in-flight GitHub requests (secondary rate limits punish bursts)
+_gh_sem = asyncio.Semaphore(10)
+
+# Serve repeat lookups from cache; stale entries are revalidated with ETags
+GITHUB_CACHE_TTL = 3600
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase and drop everything but letters and digits ('Jane Doe' -> 'janedoe')."""
+    return _NON_ALNUM_RE.sub("", name.lower())
+
+
+def names_match(a: str, b: str) -> bool:
+    """Whether two normalized names contain one another."""
+    return bool(a and b) and (a in b or b in a)
+
+
+def github_cutoff(cutoff: str) -> str:
+    """Convert a cutoff to UTC in GitHub's timestamp format, minus the trailing Z.
+
+    Cutoffs are naive local time (written by enrich_person) or carry an offset
+    (read back from Supabase); once normalized, comparing them as strings
+    against GitHub's `...Z` timestamps is valid.
+    """
+    # astimezone() treats naive datetimes as local time
+    dt = datetime.fromisoformat(cutoff.replace("Z", "+00:00")).astimezone(timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def github_headers() -> dict:
+    """Headers for authenticated GitHub API requests."""
+    config = load_config()
+    return {
         "Accept": "application/vnd.github+json",
         "Authorization": f"Bearer {config.github.token}",
         "X-GitHub-Api-Version": "2022-11-28",
     }
-    url = f"{config.github.api_url}{endpoint}"
-    print(f"    GitHub: {endpoint}")
-    response = httpx.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    return response.json()
+
+
+async def github_get(endpoint: str) -> dict | list:
+    """Make a GitHub API request."""
+    url = f"{load_config().github.api_url}{endpoint}"
+    log.debug("    GitHub: %s", endpoint)
+    return await cached_request_json(f"github:{endpoint}", GITHUB_CACHE_TTL, _gh_sem, url, headers=github_headers(), revalidate=True)
+
+
+# Profile and recently updated repos in one request (REST needs /users/{u} and /users/{u}/repos)
+USER_QUERY = """
+query($login: String!) {
+  user(login: $login) {
+    login
+    name
+    bio
+    email
+    websiteUrl
+    twitterUsername
+    url
+    followers { totalCount }
+    publicRepos: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+    recentRepos: repositories(
+      first: 10
+      privacy: PUBLIC
+      ownerAffiliations: OWNER
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      nodes { name description url primaryLanguage { name } stargazerCount updatedAt }
+    }
+  }
+}
+"""
+
+
+def check_graphql_errors(result: dict):
+    """Raise on GraphQL errors other than NOT_FOUND (which still come back as HTTP 200)."""
+    errors = [e for e in result.get("errors") or [] if e.get("type") != "NOT_FOUND"]
+    if errors:
+        raise RuntimeError(f"GitHub GraphQL error: {errors[0].get('type')}: {errors[0].get('message')}")
+
+
+async def github_user(login: str) -> dict | None:
+    """Get a user's profile and 10 most recently updated repos, or None if there's no such user."""
+    url = f"{load_config().github.api_url}/graphql"
+    log.debug("    GitHub: graphql user %s", login)
+    result = await cached_request_json(
+        f"github:graphql:user:{login}", GITHUB_CACHE_TTL, _gh_sem, url,
+        method="POST", headers=github_headers(),
+        json={"query": USER_QUERY, "variables": {"login": login}},
+        # Only a clean response (or a real NOT_FOUND) is cached
+        validate=check_graphql_errors,
+    )
+    return (result.get("data") or {}).get("user")
+
+
+async def github_events(username: str, cutoff_iso: str | None = None) -> list[dict]:
+    """Get a user's recent public events (newest first), only those at or after the cutoff.
+
+    With a cutoff the response is stream-parsed and reading stops at the first
+    older event, so the tail of the feed is never decoded.
+    """
+    endpoint = f"/users/{username}/events/public?per_page=30"
+    if not cutoff_iso:
+        return await github_get(endpoint)
+
+    url = f"{load_config().github.api_url}{endpoint}"
+    log.debug("    GitHub: %s (streaming)", endpoint)
+
+    # Revalidate against the copy cached by full runs; a 304 costs no rate limit
+    key = f"github:{endpoint}"
+    headers = github_headers()
+    cached = await asyncio.to_thread(get_cached_response, key)
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+
+    events = []
+    async with _gh_sem:
+        async with get_session().get(url, headers=headers) as response:
+            if response.status == 304 and cached:
+                await asyncio.to_thread(touch_cached_response, key, time.time())
+                return [e for e in orjson.loads(cached["body"]) if e["created_at"].rstrip("Z") >= cutoff_iso]
+            response.raise_for_status()
+            # A partial read can't refresh the cache, so only full runs update it
+            async for event in ijson.items(response.content, "item", use_float=True):
+                if event["created_at"].rstrip("Z") < cutoff_iso:
+                    break
+                events.append(event)
+    return events
 
 
 def search_github(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
     """Search GitHub for person's profile and activity."""
+    return run(search_github_async(person, incremental, cutoff))
+
+
+async def search_github_async(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
+    """Search GitHub for person's profile and activity (async)."""
     knowledge: list[KnowledgeItem] = []
     contacts: list[ContactItem] = []
 
     try:
         username = person.github  # Changed from github_username
+        user = None
 
         # Search for user if no known username
         if not username:
-            search_result = github_get(f"/search/users?q={person.name}&per_page=5")
+            search_result = await github_get(f"/search/users?q={person.name}&per_page=5")
 
             if search_result.get("items"):
                 candidate = search_result["items"][0]
+                person_key = normalize_name(person.name)
 
-                # Verify name match
-                user_details = github_get(f"/users/{candidate['login']}")
-                user_name = user_details.get("name", "").lower()
-                person_name = person.name.lower()
-
-                if user_name and (person_name in user_name or user_name in person_name):
+                # Accept a login that is the name itself; otherwise verify against
+                # the profile's display name (and keep the profile for below).
+                # Containment is too loose for logins ('john' for John Smith)
+                if normalize_name(candidate["login"]) == person_key:
                     username = candidate["login"]
+                else:
+                    user = await github_user(candidate["login"])
+                    if user and names_match(person_key, normalize_name(user.get("name") or "")):
+                        username = candidate["login"]
+
+                if username:
                     contacts.append(ContactItem(
                         contact_type="github",
                         contact_value=username,
@@ -49,23 +187,33 @@ def search_github(person: Person, incremental: bool = False, cutoff: str | None
                     ))
 
         if not username:
-            print(f"    GitHub: No user found for {person.name}")
+            log.info("    GitHub: No user found for %s", person.name)
             return EnrichmentResult(success=True, knowledge=knowledge, contacts=contacts)
 
-        # Get user profile
-        user = github_get(f"/users/{username}")
+        # Same-format UTC timestamps sort lexicographically, so compare strings instead of parsing
+        cutoff_iso = github_cutoff(cutoff) if incremental and cutoff else None
+
+        # Get recent activity and (unless already fetched) the profile + repos concurrently
+        fetches = [github_events(username, cutoff_iso)]
+        if user is None:
+            fetches.append(github_user(username))
+        events, *profile = await asyncio.gather(*fetches)
+        if profile:
+            user = profile[0]
+
+        if user is None:
+            log.info("    GitHub: User not found")
+            return EnrichmentResult(success=True, knowledge=knowledge, contacts=contacts)
 
         # Add profile knowledge
-        profile_content = " | ".join(filter(None, [
-            user.get("bio"),
-            f"Repos: {user.get('public_repos', 0)}",
-            f"Followers: {user.get('followers', 0)}",
-        ]))
+        profile_content = f"Repos: {user['publicRepos']['totalCount']} | Followers: {user['followers']['totalCount']}"
+        if user.get("bio"):
+            profile_content = f"{user['bio']} | {profile_content}"
 
         knowledge.append(KnowledgeItem(
             source_type="github",
-            source_url=user.get("html_url"),
-            title=f"GitHub: {user.get('name') or user.get('login')}",
+            source_url=user.get("url"),
+            title=f"GitHub: {user.get('name') or user['login']}",
             content=profile_content,
             content_type="profile",
         ))
@@ -79,60 +227,43 @@ def search_github(person: Person, incremental: bool = False, cutoff: str | None
                 source="github_profile",
             ))
 
-        if user.get("blog"):
+        if user.get("websiteUrl"):
             contacts.append(ContactItem(
                 contact_type="website",
-                contact_value=user["blog"],
+                contact_value=user["websiteUrl"],
                 confidence="high",
                 source="github_profile",
             ))
 
-        if user.get("twitter_username"):
+        if user.get("twitterUsername"):
             contacts.append(ContactItem(
                 contact_type="twitter",
-                contact_value=user["twitter_username"],
+                contact_value=user["twitterUsername"],
                 confidence="high",
                 source="github_profile",
             ))
 
-        # Get recent repos
-        repos = github_get(f"/users/{username}/repos?sort=updated&per_page=10")
-
-        cutoff_dt = None
-        if incremental and cutoff:
-            cutoff_dt = datetime.fromisoformat(cutoff.replace("Z", "+00:00"))
-
-        for repo in repos:
-            repo_date = datetime.fromisoformat(repo["updated_at"].replace("Z", "+00:00"))
-
-            if cutoff_dt and repo_date < cutoff_dt:
+        for repo in user["recentRepos"]["nodes"]:
+            if cutoff_iso and repo["updatedAt"].rstrip("Z") < cutoff_iso:
                 continue
 
-            repo_content = " | ".join(filter(None, [
-                repo.get("description"),
-                f"Language: {repo.get('language')}" if repo.get("language") else None,
-                f"Stars: {repo.get('stargazers_count', 0)}",
-            ]))
+            parts = []
+            if repo.get("description"):
+                parts.append(repo["description"])
+            if repo.get("primaryLanguage"):
+                parts.append(f"Language: {repo['primaryLanguage']['name']}")
+            parts.append(f"Stars: {repo['stargazerCount']}")
+            repo_content = " | ".join(parts)
 
             knowledge.append(KnowledgeItem(
                 source_type="github",
-                source_url=repo.get("html_url"),
+                source_url=repo.get("url"),
                 title=repo.get("name"),
                 content=repo_content,
                 content_type="repo",
-                content_date=repo.get("updated_at"),
+                content_date=repo.get("updatedAt"),
             ))
 
-        # Get recent activity
-        events = github_get(f"/users/{username}/events/public?per_page=30")
-
-        # Filter by date if incremental
-        if cutoff_dt:
-            events = [
-                e for e in events
-                if datetime.fromisoformat(e["created_at"].replace("Z", "+00:00")) >= cutoff_dt
-            ]
-
         # Summarize activity
         event_counts: dict[str, int] = {}
         for event in events:
@@ -150,15 +281,15 @@ def search_github(person: Person, incremental: bool = False, cutoff: str | None
                 content_date=events[0]["created_at"] if events else None,
             ))
 
-        print(f"    GitHub: {len(knowledge)} items, {len(contacts)} contacts")
+        log.info("    GitHub: %d items, %d contacts", len(knowledge), len(contacts))
         return EnrichmentResult(success=True, knowledge=knowledge, contacts=contacts)
 
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 404:
-            print(f"    GitHub: User not found")
+    except aiohttp.ClientResponseError as e:
+        if e.status == 404:
+            log.info("    GitHub: User not found")
             return EnrichmentResult(success=True, knowledge=knowledge, contacts=contacts)
-        print(f"    GitHub search failed: {e}")
+        log.warning("    GitHub search failed: %s", e)
         return EnrichmentResult(success=False, error=str(e))
     except Exception as e:
-        print(f"    GitHub search failed: {e}")
+        log.warning("    GitHub search failed: %s", e)
         return EnrichmentResult(success=False, error=str(e))
@@ -1,18 +1,95 @@
+import asyncio
+import logging
 import re
-import httpx
-from datetime import datetime
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import accumulate
 
-from ..config import config
+from ..config import load_config
+from .aio import cached_request_json, run
 from .types import EnrichmentResult, KnowledgeItem, ContactItem, Person
 
 
+log = logging.getLogger(__name__)
+
+
+# Cap in-flight SerpAPI requests to stay within the plan's QPS
+_serp_sem = asyncio.Semaphore(5)
+
+# Search results shift slowly and every SerpAPI call is billed
+SERP_CACHE_TTL = 24 * 3600
+
+_TWITTER_RE = re.compile(r"(?:twitter\.com|x\.com)/([a-zA-Z0-9_]+)")
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_RELATIVE_DATE_RE = re.compile(r"(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago", re.IGNORECASE)
+
+# Approximate: months and years only need to land in the right neighbourhood
+_RELATIVE_UNITS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+# Absolute formats SerpAPI uses for result dates ("Mar 5, 2024", "5 Mar 2024")
+_DATE_FORMATS = ("%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y")
+
+
+def first_emails(snippets: list[str]) -> list[str]:
+    """Return the first email in each snippet that has one, in one regex pass over all snippets."""
+    # "\n" can't occur inside an email match, so no match spans two snippets
+    text = "\n".join(snippets)
+    starts = list(accumulate((len(snippet) + 1 for snippet in snippets[:-1]), initial=0))
+    emails = []
+    last_index = -1
+    for match in _EMAIL_RE.finditer(text):
+        index = bisect_right(starts, match.start()) - 1
+        if index != last_index:
+            emails.append(match.group(0))
+            last_index = index
+    return emails
+
+
+@lru_cache(maxsize=4096)
+def _parse_absolute_date(value: str) -> str | None:
+    """Parse an absolute SerpAPI date to YYYY-MM-DD (None if it isn't one)."""
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            pass
+    return None
+
+
+def _normalize_date(value: str | None) -> str | None:
+    """Normalize a SerpAPI result date to ISO 8601 (None if missing or unparseable)."""
+    if not value:
+        return None
+    if _ISO_DATE_RE.match(value):
+        return value
+
+    # Relative dates depend on the current time, so they bypass the cache
+    match = _RELATIVE_DATE_RE.fullmatch(value.strip())
+    if match:
+        delta = _RELATIVE_UNITS[match.group(2).lower()] * int(match.group(1))
+        return (datetime.now() - delta).date().isoformat()
+
+    return _parse_absolute_date(value.strip())
+
+
 def format_date_filter(after: datetime) -> str:
     """Format date for Google search time filter."""
     return f"cdr:1,cd_min:{after.month}/{after.day}/{after.year}"
 
 
-def serp_search(query: str, num: int = 20, tbs: str | None = None) -> dict:
+async def serp_search(query: str, num: int = 20, tbs: str | None = None) -> dict:
     """Execute a SerpAPI search."""
+    config = load_config()
     params = {
         "api_key": config.serp.api_key,
         "engine": "google",
@@ -22,14 +99,18 @@ def serp_search(query: str, num: int = 20, tbs: str | None = None) -> dict:
     if tbs:
         params["tbs"] = tbs
 
-    print(f"    SERP: {query[:60]}...")
-    response = httpx.get(config.serp.base_url, params=params, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    log.debug("    SERP: %.60s...", query)
+    key = f"serp:{query}|{num}|{tbs or ''}"
+    return await cached_request_json(key, SERP_CACHE_TTL, _serp_sem, config.serp.base_url, params=params)
 
 
 def search_twitter(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
     """Search for person's Twitter/X activity."""
+    return run(search_twitter_async(person, incremental, cutoff))
+
+
+async def search_twitter_async(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
+    """Search for person's Twitter/X activity (async)."""
     knowledge: list[KnowledgeItem] = []
     contacts: list[ContactItem] = []
 
@@ -44,13 +125,13 @@ def search_twitter(person: Person, incremental: bool = False, cutoff: str | None
         if incremental and cutoff:
             tbs = format_date_filter(datetime.fromisoformat(cutoff))
 
-        result = serp_search(query, num=20, tbs=tbs)
+        result = await serp_search(query, num=20, tbs=tbs)
 
         for item in result.get("organic_results", []):
             link = item.get("link", "")
 
             # Extract Twitter username
-            match = re.search(r"(?:twitter\.com|x\.com)/([a-zA-Z0-9_]+)", link)
+            match = _TWITTER_RE.search(link)
             if match and not person.twitter:
                 contacts.append(ContactItem(
                     contact_type="twitter",
@@ -66,19 +147,24 @@ def search_twitter(person: Person, incremental: bool = False, cutoff: str | None
                 title=item.get("title"),
                 content=item.get("snippet", item.get("title", "")),
                 content_type="tweet",
-                content_date=item.get("date"),
+                content_date=_normalize_date(item.get("date")),
             ))
 
-        print(f"    Twitter: {len(knowledge)} results")
+        log.info("    Twitter: %d results", len(knowledge))
         return EnrichmentResult(success=True, knowledge=knowledge, contacts=contacts)
 
     except Exception as e:
-        print(f"    Twitter search failed: {e}")
+        log.warning("    Twitter search failed: %s", e)
         return EnrichmentResult(success=False, error=str(e))
 
 
 def search_linkedin(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
     """Search for person's LinkedIn profile and posts."""
+    return run(search_linkedin_async(person, incremental, cutoff))
+
+
+async def search_linkedin_async(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
+    """Search for person's LinkedIn profile and posts (async)."""
     knowledge: list[KnowledgeItem] = []
     contacts: list[ContactItem] = []
 
@@ -93,7 +179,12 @@ def search_linkedin(person: Person, incremental: bool = False, cutoff: str | Non
         if incremental and cutoff:
             tbs = format_date_filter(datetime.fromisoformat(cutoff))
 
-        result = serp_search(profile_query, num=10, tbs=tbs)
+        # Search profile and posts concurrently
+        posts_query = f'site:linkedin.com/posts "{person.name}"'
+        result, posts_result = await asyncio.gather(
+            serp_search(profile_query, num=10, tbs=tbs),
+            serp_search(posts_query, num=10, tbs=tbs),
+        )
 
         for item in result.get("organic_results", []):
             link = item.get("link", "")
@@ -116,10 +207,6 @@ def search_linkedin(person: Person, incremental: bool = False, cutoff: str | Non
                 content_type="profile",
             ))
 
-        # Search posts
-        posts_query = f'site:linkedin.com/posts "{person.name}"'
-        posts_result = serp_search(posts_query, num=10, tbs=tbs)
-
         for item in posts_result.get("organic_results", []):
             knowledge.append(KnowledgeItem(
                 source_type="linkedin",
@@ -128,19 +215,24 @@ def search_linkedin(person: Person, incremental: bool = False, cutoff: str | Non
                 title=item.get("title"),
                 content=item.get("snippet", item.get("title", "")),
                 content_type="post",
-                content_date=item.get("date"),
+                content_date=_normalize_date(item.get("date")),
             ))
 
-        print(f"    LinkedIn: {len(knowledge)} results")
+        log.info("    LinkedIn: %d results", len(knowledge))
         return EnrichmentResult(success=True, knowledge=knowledge, contacts=contacts)
 
     except Exception as e:
-        print(f"    LinkedIn search failed: {e}")
+        log.warning("    LinkedIn search failed: %s", e)
         return EnrichmentResult(success=False, error=str(e))
 
 
 def search_general(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
     """General web search for person."""
+    return run(search_general_async(person, incremental, cutoff))
+
+
+async def search_general_async(person: Person, incremental: bool = False, cutoff: str | None = None) -> EnrichmentResult:
+    """General web search for person (async)."""
     knowledge: list[KnowledgeItem] = []
     contacts: list[ContactItem] = []
 
@@ -151,10 +243,12 @@ def search_general(person: Person, incremental: bool = False, cutoff: str | None
         if incremental and cutoff:
             tbs = format_date_filter(datetime.fromisoformat(cutoff))
 
-        result = serp_search(query, num=20, tbs=tbs)
+        result = await serp_search(query, num=20, tbs=tbs)
 
+        snippets = []
         for item in result.get("organic_results", []):
-            snippet = item.get("snippet", "")
+            snippet = item.get("snippet") or ""
+            snippets.append(snippet)
 
             knowledge.append(KnowledgeItem(
                 source_type="serp",
@@ -163,22 +257,21 @@ def search_general(person: Person, incremental: bool = False, cutoff: str | None
                 title=item.get("title"),
                 content=snippet,
                 content_type="article",
-                content_date=item.get("date"),
+                content_date=_normalize_date(item.get("date")),
             ))
 
-            # Try to extract email
-            email_match = re.search(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", snippet)
-            if email_match:
-                contacts.append(ContactItem(
-                    contact_type="email",
-                    contact_value=email_match.group(0),
-                    confidence="low",
-                    source="serp_general_search",
-                ))
+        # Try to extract emails
+        for email in first_emails(snippets):
+            contacts.append(ContactItem(
+                contact_type="email",
+                contact_value=email,
+                confidence="low",
+                source="serp_general_search",
+            ))
 
-        print(f"    General: {len(knowledge)} results")
+        log.info("    General: %d results", len(knowledge))
         return EnrichmentResult(success=True, knowledge=knowledge, contacts=contacts)
 
     except Exception as e:
-        print(f"    General search failed: {e}")
+        log.warning("    General search failed: %s", e)
         return EnrichmentResult(success=False, error=str(e))
@@ -8,7 +8,7 @@ Confidence = Literal["high", "medium", "low"]
 TaskType = Literal["twitter", "linkedin", "github", "arxiv", "general", "full"]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class KnowledgeItem:
     source_type: SourceType
     content: str
@@ -19,7 +19,7 @@ class KnowledgeItem:
     content_date: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContactItem:
     contact_type: ContactType
     contact_value: str
@@ -27,7 +27,7 @@ class ContactItem:
     source: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EnrichmentResult:
     success: bool
     knowledge: list[KnowledgeItem] = field(default_factory=list)
@@ -35,7 +35,7 @@ class EnrichmentResult:
     error: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Person:
     """Person data from Supabase persons table."""
     id: str
@@ -1,3 +1,3 @@
-from .ph_profile import scrape_profile, scrape_post_people, PHProfileScraper
+from .ph_profile import scrape_profile, scrape_post_people, BrowserPool, PHProfileScraper, get_shared_pool
 
-__all__ = ["scrape_profile", "scrape_post_people", "PHProfileScraper"]
+__all__ = ["scrape_profile", "scrape_post_people", "BrowserPool", "PHProfileScraper", "get_shared_pool"]
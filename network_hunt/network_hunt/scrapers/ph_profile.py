@@ -1,35 +1,193 @@
 """Product Hunt profile scraper using Playwright."""
 
+import atexit
+import os
 import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
-from urllib.parse import urlparse
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+from pathlib import Path
+from urllib.parse import urlsplit
+import orjson
+from playwright.sync_api import sync_playwright, Page, BrowserContext, Route, TimeoutError as PlaywrightTimeoutError
 
-# 导航元素，用于过滤
-NAV_SKIP = {'About', 'Forums', 'Activity', 'Upvotes', 'Collections', 'Stacks',
-            'Reviews', 'Hunted', 'View more', 'View all', 'Report', 'Events',
-            'Meet others online and in-person', 'FAQ', 'Advertise', "What's new", 'Stories'}
+from ..config import DATA_DIR
 
+# 跨进程保存的 cookies（含 Cloudflare 的 cf_clearance）
+STORAGE_STATE_PATH = DATA_DIR / "ph_storage_state.json"
+# cf_clearance 大约 30 分钟有效，更旧的状态直接丢弃重新验证
+STORAGE_STATE_MAX_AGE = 25 * 60
 
-@dataclass
+# 导航元素，用于过滤
+NAV_SKIP = frozenset({'About', 'Forums', 'Activity', 'Upvotes', 'Collections', 'Stacks',
+                      'Reviews', 'Hunted', 'View more', 'View all', 'Report', 'Events',
+                      'Meet others online and in-person', 'FAQ', 'Advertise', "What's new", 'Stories'})
+
+# Launch Team 区域的结束标记
+LAUNCH_TEAM_END = frozenset({'Promoted', 'What do you think', 'Login to comment'})
+
+TWITTER_DOMAINS = frozenset({'x.com', 'twitter.com'})
+
+PH_URL_PREFIXES = ('https://www.producthunt.com', 'https://producthunt.com',
+                   'http://www.producthunt.com', 'http://producthunt.com')
+
+# Cloudflare 验证页特有的元素
+CF_CHALLENGE_SELECTOR = '#challenge-running, #challenge-stage, #cf-challenge-running'
+
+# 不需要下载的资源：图片/视频/字体（按扩展名，加上 PH 的图片 CDN）和统计脚本的域名。
+# 只有匹配的请求才会被拦截到 Python，其余请求直接放行（保留样式表：inner_text 的分行依赖布局）
+BLOCKED_URL = re.compile(
+    r'^[^?#]*\.(?:png|jpe?g|gif|webp|avif|svg|ico|woff2?|ttf|otf|mp4|webm)(?:[?#]|$)'
+    r'|^https?://(?:[^/]*\.)?(?:imgix\.net|google-analytics\.com|googletagmanager\.com|doubleclick\.net'
+    r'|segment\.io|segment\.com|facebook\.net|hotjar\.com|sentry\.io)(?::\d+)?/',
+    re.IGNORECASE,
+)
+
+# 预编译的正则
+_RE_USER = re.compile(r'/@(\w+)$')
+_RE_STATS_PREFIX = re.compile(r'^[#\d]')
+_RE_ABOUT = re.compile(r'About\s*\n(.+?)(?:\nLinks|\nBadges|\nMaker History|\n\d+\s*Hunted)', re.DOTALL)
+_RE_BADGES = re.compile(r'Badges\s*\n(.+?)(?:\nView all badges|\nMaker History|\nForums)', re.DOTALL)
+
+# 一次 evaluate 取回所有匹配的链接，避免逐个元素的 CDP 往返
+USER_LINK_SELECTOR = 'a[href*="/@"]'
+HREFS_JS = """sel => Array.from(document.querySelectorAll(sel), a => a.getAttribute('href') || '')"""
+LINKS_JS = """sel => Array.from(
+    document.querySelectorAll(sel),
+    a => [a.innerText.trim(), a.getAttribute('href') || '']
+)"""
+
+# hunted / collections / reviews 的逐行解析放在浏览器里做，只把结果传回来（去重在 Python 里）
+# 行的切分与 _split_lines 一致。滚动只会在后面追加内容，所以每次只解析上次停下的
+# 位置 (cursor.next) 之后的行；那一行变了 (内容被替换) 就从头解析
+HUNTED_JS = r"""cursor => {
+    const main = document.querySelector('main');
+    if (!main) return {next: 0, anchor: null, items: []};
+    const lines = main.innerText.split('\n').map(l => l.trim()).filter(Boolean);
+    const start = lines[cursor.next] === cursor.anchor ? cursor.next : 0;
+    const isNum = s => /^\d+$/.test(s);
+
+    // 产品名 (链接文本第一行) -> post slug
+    const slugs = new Map();
+    for (const a of main.querySelectorAll('a[href*="/posts/"]')) {
+        const name = a.innerText.split('\n')[0].trim();
+        const slug = a.getAttribute('href').split(/[?#]/)[0].split('/posts/')[1].split('/')[0];
+        if (name && slug && !slugs.has(name)) slugs.set(name, slug);
+    }
+
+    const posts = [];
+    for (let i = start; i < lines.length - 3; i++) {
+        // 格式: 产品名 / [tagline] / votes / comments → [产品名, tagline, votes, comments, slug]
+        const line = lines[i];
+        const len = [...line].length;
+        if (isNum(line) || len <= 3 || len >= 80) continue;
+        const [n1, n2, n3] = [lines[i + 1], lines[i + 2], lines[i + 3]];
+        if (!isNum(n1) && isNum(n2) && isNum(n3)) {
+            posts.push([line, n1, parseInt(n2, 10), parseInt(n3, 10), slugs.get(line) ?? null]);
+        } else if (isNum(n1) && isNum(n2)) {
+            posts.push([line, null, parseInt(n1, 10), parseInt(n2, 10), slugs.get(line) ?? null]);
+        }
+    }
+    const next = Math.max(0, lines.length - 3);
+    return {next, anchor: lines[next] ?? null, items: posts};
+}"""
+
+COLLECTIONS_JS = r"""cursor => {
+    const main = document.querySelector('main');
+    if (!main) return {next: 0, anchor: null, items: []};
+    const lines = main.innerText.split('\n').map(l => l.trim()).filter(Boolean);
+    const start = lines[cursor.next] === cursor.anchor ? cursor.next : 0;
+    const names = [];
+    for (let i = start; i < lines.length - 1; i++) {
+        // 格式: 集合名 / "N products"
+        const line = lines[i];
+        if (/^\d+\s+products?/.test(lines[i + 1]) && !/^\d+$/.test(line) && [...line].length < 100) {
+            names.push(line);
+        }
+    }
+    const next = Math.max(0, lines.length - 1);
+    return {next, anchor: lines[next] ?? null, items: names};
+}"""
+
+REVIEWS_JS = r"""cursor => {
+    const main = document.querySelector('main');
+    if (!main) return {next: 0, anchor: null, items: []};
+    const lines = main.innerText.split('\n').map(l => l.trim()).filter(Boolean);
+    const start = lines[cursor.next] === cursor.anchor ? cursor.next : 0;
+    const end = new Set(['Helpful', 'Share', 'Report']);
+    const ago = /^\d+[dhm]?\s*ago/;
+    const isEnd = line => end.has(line) || line.includes('views') || ago.test(line);
+    const reviews = [];
+    for (let i = start; i < lines.length - 5; i++) {
+        // 格式: "used" / 工具名 / "to build" / 产品名 / ... / 评论内容 / Helpful
+        if (lines[i] !== 'used' || lines[i + 2] !== 'to build') continue;
+
+        // 跳过 points/reviews 行，找评论内容
+        let j = i + 4;
+        while (j < lines.length && (lines[j].includes('points') || lines[j].includes('reviews') || lines[j] === '•')) j++;
+
+        // 收集到 Helpful/Share/Report (或浏览数/时间) 为止
+        const parts = [];
+        while (j < lines.length && !isEnd(lines[j])) parts.push(lines[j++]);
+        reviews.push([lines[i + 1], lines[i + 3], parts.join(' ').trim()]);
+    }
+    const next = Math.max(0, lines.length - 5);
+    return {next, anchor: lines[next] ?? null, items: reviews};
+}"""
+
+# profile 主页需要的数据一次取回: h1 / h1 的祖父元素 (header) / main 文本 / 头像 / 所有链接，
+# 以及在浏览器里从 main 文本解析出的计数（没有 main 时退回 body）
+PROFILE_TEXT_JS = r"""() => {
+    const h1 = document.querySelector('h1');
+    const name = h1 ? h1.innerText.trim() : null;
+    const avatar = name !== null ? Array.from(document.images).find(img => img.alt === name) : null;
+    const header = h1 && h1.parentElement && h1.parentElement.parentElement;
+    const main = document.querySelector('main');
+    const mainText = main ? main.innerText : null;
+    const text = mainText ?? document.body.innerText;
+    const counts = {};
+    for (const [attr, re] of [
+        ['followers_count', /([\d,]+)\s*followers/i],
+        ['following_count', /([\d,]+)\s*following/i],
+        ['hunted_count', /([\d,]+)\s*Hunted/i],
+        ['collections_count', /([\d,]+)\s*Collections/i],
+        ['reviews_count', /([\d,]+)\s*Reviews/i],
+    ]) {
+        const m = text.match(re);
+        const n = m ? parseInt(m[1].replace(/,/g, ''), 10) : NaN;
+        if (!isNaN(n)) counts[attr] = n;
+    }
+    return {
+        name,
+        header: header ? header.innerText : null,
+        main: mainText,
+        avatar: avatar ? avatar.getAttribute('src') : null,
+        hrefs: Array.from(document.querySelectorAll('a[href]'), a => a.getAttribute('href')),
+        counts,
+    };
+}"""
+
+
+@dataclass(slots=True)
 class PHReview:
     tool_name: str
     product_name: str
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PHCollection:
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PHMakerProduct:
     name: str
     slug: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PHProfile:
     username: str
     name: str | None = None
@@ -53,14 +211,161 @@ class PHProfile:
     reviews: list[PHReview] = field(default_factory=list)
 
 
+def profile_to_row(profile: PHProfile) -> dict:
+    """Convert a profile into a ph_profiles row (empty lists are stored as NULL)."""
+    return {
+        "username": profile.username,
+        "name": profile.name,
+        "headline": profile.headline,
+        "bio": profile.bio,
+        "avatar_url": profile.avatar_url,
+        "links": profile.links or None,
+        "followers_count": profile.followers_count,
+        "following_count": profile.following_count,
+        "hunted_count": profile.hunted_count,
+        "collections_count": profile.collections_count,
+        "reviews_count": profile.reviews_count,
+        "badges": profile.badges or None,
+        "following": profile.following or None,
+        "hunted_posts": profile.hunted_posts or None,
+        "collections": [c.name for c in profile.collections] or None,
+        "reviews": [
+            {"tool": r.tool_name, "product": r.product_name, "text": r.text}
+            for r in profile.reviews
+        ] or None,
+    }
+
+
+def _abort(route: Route):
+    """Abort a request for an asset the scraper never reads or an analytics host."""
+    route.abort()
+
+
+class BrowserPool:
+    """A single Chromium process that hands out browser contexts.
+
+    Launching Chromium takes seconds, a context only milliseconds, so scrapers
+    borrow a context and give it back instead of starting their own browser.
+    Playwright's sync API is bound to the thread that started it: use a pool,
+    and the contexts it hands out, from one thread only.
+    """
+
+    def __init__(
+        self,
+        headless: bool = False,
+        max_contexts: int = 2,
+        warm: bool = True,
+        storage_state_path: Path | None = STORAGE_STATE_PATH,
+    ):
+        self.headless = headless
+        self.max_contexts = max_contexts
+        self.warm = warm
+        self.storage_state_path = storage_state_path
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(
+            headless=headless,
+            args=['--disable-blink-features=AutomationControlled']
+        )
+        self._idle: list[BrowserContext] = [self._new_context() for _ in range(max_contexts)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _new_context(self) -> BrowserContext:
+        state = self._load_storage_state()
+        context = self._browser.new_context(
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            viewport={'width': 1920, 'height': 1080},
+            extra_http_headers={'Accept-Language': 'en-US,en'},
+            storage_state=state,
+        )
+        context.route(BLOCKED_URL, _abort)
+        if self.warm and state is None and self._warm_up(context):
+            self._save_storage_state(context)
+        return context
+
+    def _load_storage_state(self) -> dict | None:
+        """Load the saved cookies if they are recent enough to still pass Cloudflare."""
+        path = self.storage_state_path
+        if path is None:
+            return None
+        try:
+            if time.time() - path.stat().st_mtime > STORAGE_STATE_MAX_AGE:
+                return None
+            return orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def _save_storage_state(self, context: BrowserContext):
+        """Save a context's cookies for later pools (write-then-rename, other threads may be reading)."""
+        path = self.storage_state_path
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(orjson.dumps(context.storage_state()))
+        os.replace(tmp, path)
+
+    def _warm_up(self, context: BrowserContext) -> bool:
+        """Visit the home page once so the context already holds Cloudflare's clearance cookie.
+
+        Best effort: returns False on failure, and the first scrape does the waiting.
+        """
+        page = context.new_page()
+        try:
+            page.goto('https://www.producthunt.com/', wait_until='domcontentloaded', timeout=30000)
+            page.wait_for_selector('main', timeout=20000)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        finally:
+            page.close()
+
+    def acquire(self) -> BrowserContext:
+        """Borrow an idle context, creating one if none is free."""
+        if self._idle:
+            return self._idle.pop()
+        return self._new_context()
+
+    def release(self, context: BrowserContext):
+        """Give a context back. Its cookies (incl. Cloudflare clearance) are kept for the next scrape."""
+        for page in context.pages:
+            page.close()
+        if len(self._idle) < self.max_contexts:
+            self._idle.append(context)
+        else:
+            context.close()
+
+    def close(self):
+        """Close all contexts and the browser, saving cookies for the next run."""
+        try:
+            if self._idle:
+                self._save_storage_state(self._idle[0])
+        except Exception as e:
+            # 保存失败只是下次要重新过 Cloudflare，不能因此漏关浏览器
+            print(f"  Failed to save storage state: {e}")
+        finally:
+            try:
+                for context in self._idle:
+                    context.close()
+                self._idle.clear()
+                self._browser.close()
+            finally:
+                self._playwright.stop()
+
+
 class PHProfileScraper:
     """Scraper for Product Hunt user profiles."""
 
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, pool: BrowserPool | None = None):
         self.headless = headless
-        self.browser: Browser | None = None
+        self.pool = pool
+        self._owns_pool = pool is None
+        self.context: BrowserContext | None = None
         self.page: Page | None = None
-        self._playwright = None
 
     def __enter__(self):
         self.start()
@@ -70,72 +375,122 @@ class PHProfileScraper:
         self.close()
 
     def start(self):
-        """Start browser."""
-        self._playwright = sync_playwright().start()
-        self.browser = self._playwright.chromium.launch(
-            headless=self.headless,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        context = self.browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            viewport={'width': 1920, 'height': 1080},
-        )
-        self.page = context.new_page()
+        """Borrow a context from the pool (launching a private pool if none was given)."""
+        if self.pool is None:
+            self.pool = BrowserPool(headless=self.headless, max_contexts=1)
+        self.context = self.pool.acquire()
+        self.page = self.context.new_page()
 
     def close(self):
-        """Close browser."""
-        if self.browser:
-            self.browser.close()
-        if self._playwright:
-            self._playwright.stop()
-
-    def _wait_for_load(self):
+        """Return the context to the pool, closing the pool if this scraper launched it."""
+        if self.context:
+            self.pool.release(self.context)
+            self.context = None
+            self.page = None
+        if self._owns_pool and self.pool:
+            self.pool.close()
+            self.pool = None
+
+    def _wait_for_load(self, page: Page):
         """Wait for page to load past Cloudflare."""
-        self.page.wait_for_timeout(5000)
-        if 'Just a moment' in self.page.title():
-            self.page.wait_for_timeout(10000)
-            if 'Just a moment' in self.page.title():
+        page.wait_for_load_state('domcontentloaded', timeout=30000)
+        # Real pages are server-rendered, so <main> is usually there already;
+        # a challenge page gets longer to solve itself and redirect
+        challenged = page.locator(CF_CHALLENGE_SELECTOR).count() > 0
+        try:
+            page.wait_for_selector('main', timeout=20000 if challenged else 10000)
+        except PlaywrightTimeoutError:
+            if challenged:
                 raise Exception("Blocked by Cloudflare")
 
-    def _scroll_once(self) -> bool:
+    def _scroll_once(self, page: Page) -> bool:
         """Scroll to bottom. Returns True if page height changed."""
-        prev = self.page.evaluate('document.body.scrollHeight')
-        self.page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-        self.page.wait_for_timeout(1500)
-        return self.page.evaluate('document.body.scrollHeight') != prev
-
-    def _get_lines(self) -> list[str]:
+        prev = page.evaluate('() => { const h = document.body.scrollHeight; window.scrollTo(0, h); return h; }')
+        try:
+            page.wait_for_function('prev => document.body.scrollHeight !== prev', arg=prev, timeout=2000)
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    def _scroll_until_count(self, page: Page, selector: str, timeout_ms: int = 2000) -> bool:
+        """Scroll to bottom. Returns True once more elements match `selector`."""
+        prev = page.evaluate(
+            'sel => { window.scrollTo(0, document.body.scrollHeight); return document.querySelectorAll(sel).length; }',
+            selector,
+        )
+        try:
+            page.wait_for_function(
+                '([sel, prev]) => document.querySelectorAll(sel).length > prev',
+                arg=[selector, prev],
+                timeout=timeout_ms,
+            )
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    def _collect_hrefs(self, page: Page, selector: str) -> list[str]:
+        """Get the href of every element matching `selector` in one round-trip."""
+        return page.evaluate(HREFS_JS, selector)
+
+    def _collect_links(self, page: Page, selector: str) -> list[tuple[str, str]]:
+        """Get (text, href) for every element matching `selector` in one round-trip."""
+        return page.evaluate(LINKS_JS, selector)
+
+    def _extract_new(self, page: Page, js: str, cursor: dict) -> list:
+        """Run an in-page extractor over the lines added since its last run (updates `cursor`)."""
+        result = page.evaluate(js, cursor)
+        cursor.update(next=result['next'], anchor=result['anchor'])
+        return result['items']
+
+    @staticmethod
+    def _split_lines(text: str) -> list[str]:
+        """Split text into stripped, non-empty lines."""
+        # 只按 '\n' 切，与 JS 里的 innerText.split('\n') 一致（splitlines 还会切 \r、\u2028 等）
+        return [l for l in map(str.strip, text.split('\n')) if l]
+
+    def _get_lines(self, page: Page) -> list[str]:
         """Get non-empty lines from main content."""
-        main = self.page.query_selector('main')
+        main = page.query_selector('main')
         if not main:
             return []
-        return [l.strip() for l in main.inner_text().split('\n') if l.strip()]
+        return self._split_lines(main.inner_text())
 
     def scrape_profile_main(self, username: str) -> PHProfile:
         """Scrape main profile page."""
-        print(f"Scraping profile: @{username}")
+        profile, text = self._load_profile_main(username)
+        self._parse_profile_main(profile, text)
+        return profile
 
-        self.page.goto(f'https://www.producthunt.com/@{username}', timeout=60000)
-        self._wait_for_load()
+    def _load_profile_main(self, username: str, page: Page | None = None) -> tuple[PHProfile, dict]:
+        """Open the main profile page and read its counts. Returns the profile and the page text.
 
-        profile = PHProfile(username=username)
+        `page` is one _open_tab already started on the main page; by default
+        self.page is navigated there.
+        """
+        print(f"Scraping profile: @{username}")
+        if page is None:
+            page = self.page
+            page.goto(self._profile_url(username), timeout=60000)
+        self._wait_for_load(page)
 
+        text = page.evaluate(PROFILE_TEXT_JS)
+        return PHProfile(username=username, **text['counts']), text
+
+    def _parse_profile_main(self, profile: PHProfile, text: dict):
+        """Fill in name, headline, avatar, bio, badges and links from the loaded main page."""
         # Name and Headline - usually h1 followed by headline text
-        h1 = self.page.query_selector('h1')
-        if h1:
-            profile.name = h1.inner_text().strip()
+        if text['name'] is not None:
+            profile.name = text['name']
             # Headline is in the grandparent element of h1
             # Structure: name -> badge -> headline -> stats
-            header = h1.evaluate_handle('el => el.parentElement.parentElement')
-            if header:
-                header_text = header.as_element().inner_text()
-                lines = [l.strip() for l in header_text.split('\n') if l.strip()]
+            if text['header']:
+                lines = self._split_lines(text['header'])
                 # First line is name, collect headline lines after it
                 if len(lines) >= 2 and lines[0] == profile.name:
                     headline_parts = []
                     for line in lines[1:]:
                         # Stop at stats (starts with # or digit, or contains "followers")
-                        if re.match(r'^[#\d]', line) or 'followers' in line.lower():
+                        if _RE_STATS_PREFIX.match(line) or 'followers' in line.lower():
                             break
                         # Skip very long lines or navigation elements
                         if len(line) > 100:
@@ -147,188 +502,144 @@ class PHProfileScraper:
                     if headline_parts:
                         profile.headline = ' | '.join(headline_parts)
 
-        # Avatar
-        avatar = self.page.query_selector(f'img[alt="{profile.name}"]')
-        if avatar:
-            profile.avatar_url = avatar.get_attribute('src')
+        # Avatar - the img whose alt is the name
+        profile.avatar_url = text['avatar']
 
         # Bio and badges from main text
-        main = self.page.query_selector('main')
-        if main:
-            main_text = main.inner_text()
+        main_text = text['main']
+        if main_text:
             # Bio
-            about = re.search(r'About\s*\n(.+?)(?:\nLinks|\nBadges|\nMaker History|\n\d+\s*Hunted)', main_text, re.DOTALL)
+            about = _RE_ABOUT.search(main_text)
             if about:
                 profile.bio = about.group(1).strip()
             # Badges
-            badges = re.search(r'Badges\s*\n(.+?)(?:\nView all badges|\nMaker History|\nForums)', main_text, re.DOTALL)
+            badges = _RE_BADGES.search(main_text)
             if badges:
-                profile.badges = [l.strip() for l in badges.group(1).split('\n') if l.strip() and len(l) < 50]
+                profile.badges = [l.strip() for l in badges.group(1).splitlines() if l.strip() and len(l) < 50]
 
         # Links - collect external URLs (exclude producthunt-related links)
         seen_urls = set()
-        for link in self.page.query_selector_all('a[href]'):
-            href = link.get_attribute('href') or ''
-            # Only external links
-            if not href.startswith('http'):
-                continue
-            # Extract domain for filtering (ignore query params)
-            domain = urlparse(href).netloc.lower()
-            # Skip producthunt-related domains
-            if 'producthunt' in domain:
-                continue
-            # Skip links to PH events or PH social accounts
-            if domain == 'lu.ma' and 'producthunt' in href.lower():
+        for href in text['hrefs']:
+            # Only external links; most anchors are PH's own, so drop those (and repeats) first
+            if href in seen_urls or not href.startswith('http') or href.startswith(PH_URL_PREFIXES):
                 continue
-            if (domain in ('x.com', 'twitter.com') and
-                href.lower().rstrip('/').endswith('/producthunt')):
-                continue
-            if (domain == 'www.linkedin.com' and
-                '/company/producthunt' in href.lower()):
-                continue
-            if href not in seen_urls:
-                seen_urls.add(href)
-                profile.links.append(href)
-
-        # Counts
-        page_text = self.page.content()
-        for pattern, attr in [
-            (r'([\d,]+)\s*followers', 'followers_count'),
-            (r'([\d,]+)\s*following', 'following_count'),
-            (r'([\d,]+)\s*Hunted', 'hunted_count'),
-            (r'([\d,]+)\s*Collections', 'collections_count'),
-            (r'([\d,]+)\s*Reviews', 'reviews_count'),
-        ]:
-            m = re.search(pattern, page_text, re.IGNORECASE)
-            if m:
-                setattr(profile, attr, int(m.group(1).replace(',', '')))
-
-        return profile
-
-    def _goto_tab(self, username: str, tab: str):
-        """Navigate to a profile tab."""
-        self.page.goto(f'https://www.producthunt.com/@{username}/{tab}', timeout=60000)
-        self._wait_for_load()
-
-    def scrape_following(self, username: str, max_items: int = 200) -> list[str]:
+            seen_urls.add(href)
+            href_lower = href.lower()
+            # Every PH domain, event or social account link mentions producthunt,
+            # so only those need their domain parsed
+            if 'producthunt' in href_lower:
+                domain = urlsplit(href_lower).netloc
+                if ('producthunt' in domain or domain == 'lu.ma' or
+                        (domain in TWITTER_DOMAINS and href_lower.rstrip('/').endswith('/producthunt')) or
+                        (domain == 'www.linkedin.com' and '/company/producthunt' in href_lower)):
+                    continue
+            profile.links.append(href)
+
+    @staticmethod
+    def _profile_url(username: str, tab: str = '') -> str:
+        return f'https://www.producthunt.com/@{username}/{tab}' if tab else f'https://www.producthunt.com/@{username}'
+
+    def _open_tab(self, username: str, tab: str = '') -> Page:
+        """Open a profile tab (default: the main page) in a new page without waiting for it to load."""
+        page = self.context.new_page()
+        page.goto(self._profile_url(username, tab), wait_until='commit', timeout=60000)
+        return page
+
+    def _goto_tab(self, page: Page, username: str, tab: str):
+        """Navigate to a profile tab (unless _open_tab already did)."""
+        url = self._profile_url(username, tab)
+        if page.url != url:
+            page.goto(url, timeout=60000)
+        self._wait_for_load(page)
+
+    def scrape_following(self, username: str, max_items: int = 200, page: Page | None = None) -> list[str]:
         """Scrape following list."""
+        page = page or self.page
         print(f"Scraping following for @{username} (max {max_items})")
-        self._goto_tab(username, 'following')
+        self._goto_tab(page, username, 'following')
 
-        following = set()
+        # dict.fromkeys dedupes while keeping page order
+        following: dict[str, None] = {}
         for _ in range(max_items // 20 + 1):
-            for link in self.page.query_selector_all('a[href*="/@"]'):
-                href = link.get_attribute('href') or ''
-                m = re.search(r'/@(\w+)$', href)
-                if m and m.group(1) != username:
-                    following.add(m.group(1))
+            matches = map(_RE_USER.search, self._collect_hrefs(page, USER_LINK_SELECTOR))
+            following.update(dict.fromkeys(m.group(1) for m in matches if m and m.group(1) != username))
 
-            if len(following) >= max_items or not self._scroll_once():
+            if len(following) >= max_items or not self._scroll_until_count(page, USER_LINK_SELECTOR):
                 break
 
         result = list(following)[:max_items]
         print(f"  Found {len(result)} following")
         return result
 
-    def scrape_hunted(self, username: str, max_items: int = 100) -> list[dict]:
-        """Scrape hunted posts. Returns list of {name, tagline, votes, comments}."""
+    def scrape_hunted(self, username: str, max_items: int = 100, page: Page | None = None) -> list[dict]:
+        """Scrape hunted posts. Returns list of {name, tagline, votes, comments, slug}."""
+        page = page or self.page
         print(f"Scraping hunted posts for @{username} (max {max_items})")
-        self._goto_tab(username, 'submitted')
+        self._goto_tab(page, username, 'submitted')
 
         posts = []
-        seen = set()
+        seen = set()  # post slugs (names for posts without a link)
+        taglines = set()  # tagline lines can look like post names; never take them as one
 
+        cursor = {'next': 0, 'anchor': None}
         for _ in range(max_items // 5 + 1):
-            lines = self._get_lines()
-            i = 0
-            while i < len(lines) - 3:
-                line = lines[i]
-                if line and not line.isdigit() and 3 < len(line) < 80:
-                    n1, n2, n3 = lines[i+1], lines[i+2], lines[i+3]
-                    tagline, nums = None, []
-
-                    if not n1.isdigit() and n2.isdigit() and n3.isdigit():
-                        tagline, nums = n1, [int(n2), int(n3)]
-                    elif n1.isdigit() and n2.isdigit():
-                        nums = [int(n1), int(n2)]
-
-                    if nums and line not in seen and line not in NAV_SKIP:
-                        if not line.endswith('followers') and not line.endswith('following'):
-                            seen.add(line)
-                            if tagline:
-                                seen.add(tagline)
-                            posts.append({'name': line, 'tagline': tagline, 'votes': nums[0], 'comments': nums[1]})
-                i += 1
-
-            if len(posts) >= max_items or not self._scroll_once():
+            for name, tagline, votes, comments, slug in self._extract_new(page, HUNTED_JS, cursor):
+                key = slug or name
+                if key in seen or name in taglines or name in NAV_SKIP or name.endswith(('followers', 'following')):
+                    continue
+                seen.add(key)
+                if tagline:
+                    taglines.add(tagline)
+                posts.append({'name': name, 'tagline': tagline, 'votes': votes, 'comments': comments, 'slug': slug})
+
+            if len(posts) >= max_items or not self._scroll_until_count(page, 'a[href*="/posts/"]'):
                 break
 
         result = posts[:max_items]
         print(f"  Found {len(result)} hunted posts")
         return result
 
-    def scrape_collections(self, username: str, max_items: int = 100) -> list[PHCollection]:
+    def scrape_collections(self, username: str, max_items: int = 100, page: Page | None = None) -> list[PHCollection]:
         """Scrape collections."""
+        page = page or self.page
         print(f"Scraping collections for @{username} (max {max_items})")
-        self._goto_tab(username, 'collections')
+        self._goto_tab(page, username, 'collections')
 
         collections = []
         seen = set()
 
+        cursor = {'next': 0, 'anchor': None}
         for _ in range(max_items // 5 + 1):
-            lines = self._get_lines()
-            for i, line in enumerate(lines[:-1]):
-                next_line = lines[i + 1]
-                if re.match(r'\d+\s+products?', next_line) and line not in seen and line not in NAV_SKIP:
-                    if line and not line.isdigit() and len(line) < 100:
-                        seen.add(line)
-                        collections.append(PHCollection(name=line))
-
-            if len(collections) >= max_items or not self._scroll_once():
+            for name in self._extract_new(page, COLLECTIONS_JS, cursor):
+                if name not in seen and name not in NAV_SKIP:
+                    seen.add(name)
+                    collections.append(PHCollection(name=name))
+
+            if len(collections) >= max_items or not self._scroll_once(page):
                 break
 
         result = collections[:max_items]
         print(f"  Found {len(result)} collections")
         return result
 
-    def scrape_reviews(self, username: str, max_items: int = 50) -> list[PHReview]:
+    def scrape_reviews(self, username: str, max_items: int = 50, page: Page | None = None) -> list[PHReview]:
         """Scrape reviews."""
+        page = page or self.page
         print(f"Scraping reviews for @{username} (max {max_items})")
-        self._goto_tab(username, 'reviews')
+        self._goto_tab(page, username, 'reviews')
 
         reviews = []
         seen = set()
 
+        cursor = {'next': 0, 'anchor': None}
         for _ in range(max_items // 5 + 1):
-            lines = self._get_lines()
-            i = 0
-            while i < len(lines) - 5:
-                # 格式: "used" / 工具名 / "to build" / 产品名 / ... / 评论内容 / Helpful
-                if lines[i] == 'used' and lines[i + 2] == 'to build':
-                    tool, product = lines[i + 1], lines[i + 3]
-
-                    # 跳过 points/reviews 行，找评论内容
-                    j = i + 4
-                    while j < len(lines) and ('points' in lines[j] or 'reviews' in lines[j] or lines[j] == '•'):
-                        j += 1
-
-                    # 收集到 Helpful/Share/Report 为止
-                    text_parts = []
-                    while j < len(lines) and lines[j] not in ['Helpful', 'Share', 'Report']:
-                        if 'views' not in lines[j] and not re.match(r'\d+[dhm]?\s*ago', lines[j]):
-                            text_parts.append(lines[j])
-                        else:
-                            break
-                        j += 1
+            for tool, product, text in self._extract_new(page, REVIEWS_JS, cursor):
+                key = (tool, product)
+                if text and key not in seen:
+                    seen.add(key)
+                    reviews.append(PHReview(tool_name=tool, product_name=product, text=text[:500]))
 
-                    text = ' '.join(text_parts).strip()
-                    key = (tool, product)
-                    if text and key not in seen:
-                        seen.add(key)
-                        reviews.append(PHReview(tool_name=tool, product_name=product, text=text[:500]))
-                i += 1
-
-            if len(reviews) >= max_items or not self._scroll_once():
+            if len(reviews) >= max_items or not self._scroll_once(page):
                 break
 
         result = reviews[:max_items]
@@ -339,31 +650,86 @@ class PHProfileScraper:
         self, username: str,
         max_following: int = 200, max_hunted: int = 100,
         max_collections: int = 100, max_reviews: int = 50,
+        page: Page | None = None,
     ) -> PHProfile:
         """Scrape complete profile with all second-level data."""
-        profile = self.scrape_profile_main(username)
-
-        if profile.following_count > 0:
-            profile.following = self.scrape_following(username, max_following)
-        if profile.hunted_count > 0:
-            profile.hunted_posts = self.scrape_hunted(username, max_hunted)
-        if profile.collections_count > 0:
-            profile.collections = self.scrape_collections(username, max_collections)
-        if profile.reviews_count > 0:
-            profile.reviews = self.scrape_reviews(username, max_reviews)
+        profile, text = self._load_profile_main(username, page)
+
+        tabs = [
+            (attr, tab, scrape, max_items)
+            for attr, tab, scrape, max_items, count in (
+                ('following', 'following', self.scrape_following, max_following, profile.following_count),
+                ('hunted_posts', 'submitted', self.scrape_hunted, max_hunted, profile.hunted_count),
+                ('collections', 'collections', self.scrape_collections, max_collections, profile.collections_count),
+                ('reviews', 'reviews', self.scrape_reviews, max_reviews, profile.reviews_count),
+            )
+            if count > 0
+        ]
+
+        # The counts are all we need to pick the tabs, so start every tab
+        # navigation now: their load/Cloudflare waits overlap with each other
+        # and with parsing the main page, then the pages are scraped in turn
+        # (the sync API can only drive them from this thread)
+        tab_pages = []
+        try:
+            for _, tab, _, _ in tabs:
+                tab_pages.append(self._open_tab(username, tab))
+            self._parse_profile_main(profile, text)
+            for (attr, _, scrape, max_items), tab_page in zip(tabs, tab_pages):
+                setattr(profile, attr, scrape(username, max_items, page=tab_page))
+        finally:
+            for tab_page in tab_pages:
+                tab_page.close()
 
         return profile
 
+    def scrape_full_profiles(
+        self, usernames: Iterable[str], **kwargs,
+    ) -> Iterator[tuple[str, PHProfile | None, Exception | None]]:
+        """Scrape profiles in turn, yielding (username, profile, error).
+
+        The next user's main page starts loading in its own page while the
+        current profile is scraped, so its load/Cloudflare wait is hidden.
+        """
+        usernames = iter(usernames)
+        ahead = self._prefetch(next(usernames, None))
+        while ahead:
+            username, page = ahead
+            ahead = self._prefetch(next(usernames, None))
+            try:
+                yield username, self.scrape_full_profile(username, page=page, **kwargs), None
+            except Exception as e:
+                yield username, None, e
+            finally:
+                if page:
+                    page.close()
+
+    def _prefetch(self, username: str | None) -> tuple[str, Page | None] | None:
+        """Start loading a user's main page. The page is None if the navigation failed to start."""
+        if username is None:
+            return None
+        try:
+            return username, self._open_tab(username)
+        except Exception:
+            # scrape_full_profile navigates self.page itself and reports the error
+            return username, None
 
     def scrape_post_people(self, slug: str) -> list[str]:
         """Scrape makers/hunters from a post page. Returns list of usernames."""
         print(f"Scraping post: {slug}")
-        self.page.goto(f'https://www.producthunt.com/posts/{slug}', timeout=60000)
-        self._wait_for_load()
+        page = self.page
+        page.goto(f'https://www.producthunt.com/posts/{slug}', timeout=60000)
+        self._wait_for_load(page)
 
         makers = []
         seen = set()
-        lines = self._get_lines()
+        lines = self._get_lines(page)
+
+        # 链接文本 -> href（同名取第一个）
+        links = self._collect_links(page, USER_LINK_SELECTOR)
+        anchor_map: dict[str, str] = {}
+        for text, href in links:
+            anchor_map.setdefault(text, href)
 
         # 策略1: 找 "Maker" 标签前面的用户名
         # 页面结构: "用户名" / "公司名" / "Maker" / 评论内容...
@@ -376,15 +742,12 @@ class PHProfileScraper:
                         # 用户名通常短，不含特殊字符
                         if candidate and len(candidate) < 50 and candidate not in seen:
                             # 验证是否真的是用户链接
-                            for link in self.page.query_selector_all('a[href*="/@"]'):
-                                link_text = link.inner_text().strip()
-                                if link_text == candidate:
-                                    href = link.get_attribute('href') or ''
-                                    m = re.search(r'/@(\w+)$', href)
-                                    if m:
-                                        seen.add(candidate)
-                                        makers.append(m.group(1))
-                                    break
+                            href = anchor_map.get(candidate)
+                            if href is not None:
+                                m = _RE_USER.search(href)
+                                if m:
+                                    seen.add(candidate)
+                                    makers.append(m.group(1))
 
         # 策略2: 如果没找到，看 "Launch Team" 区域的链接
         if not makers:
@@ -392,13 +755,12 @@ class PHProfileScraper:
             for i, line in enumerate(lines):
                 if line == 'Launch Team':
                     in_launch_team = True
-                elif in_launch_team and line in ('Promoted', 'What do you think', 'Login to comment'):
+                elif in_launch_team and line in LAUNCH_TEAM_END:
                     break
                 elif in_launch_team:
                     # 在 Launch Team 区域内找用户链接
-                    for link in self.page.query_selector_all('a[href*="/@"]'):
-                        href = link.get_attribute('href') or ''
-                        m = re.search(r'/@(\w+)$', href)
+                    for _, href in links:
+                        m = _RE_USER.search(href)
                         if m and m.group(1) not in seen:
                             seen.add(m.group(1))
                             makers.append(m.group(1))
@@ -408,13 +770,47 @@ class PHProfileScraper:
         return makers
 
 
-def scrape_profile(username: str, headless: bool = False, **kwargs) -> PHProfile:
-    """Convenience function to scrape a profile."""
-    with PHProfileScraper(headless=headless) as scraper:
+_shared_pool: BrowserPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool(headless: bool = False) -> BrowserPool | None:
+    """Get the process-wide browser pool, or None if this call can't use it.
+
+    The pool is launched on first use and closed at exit, so repeated scrapes
+    and worker runs skip the browser start-up. Playwright ties it to the
+    thread that launched it, so it lives on the main thread: calls from other
+    threads, or with a different headless setting, get None and fall back to
+    a private browser.
+    """
+    global _shared_pool
+    if threading.current_thread() is not threading.main_thread():
+        return None
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool(headless=headless, max_contexts=1)
+            atexit.register(_shared_pool.close)
+        if _shared_pool.headless != headless:
+            return None
+        return _shared_pool
+
+
+def scrape_profile(
+    username: str, headless: bool = False, scraper: PHProfileScraper | None = None, **kwargs,
+) -> PHProfile:
+    """Convenience function to scrape a profile.
+
+    Pass a started `scraper` to reuse its page across many calls.
+    """
+    if scraper is not None:
+        return scraper.scrape_full_profile(username, **kwargs)
+    with PHProfileScraper(headless=headless, pool=get_shared_pool(headless)) as scraper:
         return scraper.scrape_full_profile(username, **kwargs)
 
 
-def scrape_post_people(slug: str, headless: bool = False) -> list[str]:
+def scrape_post_people(slug: str, headless: bool = False, scraper: PHProfileScraper | None = None) -> list[str]:
     """Convenience function to scrape usernames from a post."""
-    with PHProfileScraper(headless=headless) as scraper:
+    if scraper is not None:
+        return scraper.scrape_post_people(slug)
+    with PHProfileScraper(headless=headless, pool=get_shared_pool(headless)) as scraper:
         return scraper.scrape_post_people(slug)
@@ -1,6 +1,7 @@
 from .base import BaseWorker
+from .browser_worker import BrowserWorker
 from .api_worker import APIWorker
 from .post_scraper import PostScraperWorker
 from .profile_scraper import ProfileScraperWorker
 
-__all__ = ["BaseWorker", "APIWorker", "PostScraperWorker", "ProfileScraperWorker"]
+__all__ = ["BaseWorker", "BrowserWorker", "APIWorker", "PostScraperWorker", "ProfileScraperWorker"]
@@ -1,30 +1,34 @@
 """API Worker for crawling Product Hunt API."""
 
-import time
+import asyncio
+import logging
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
+import orjson
 from gql import gql, Client
-from gql.transport.httpx import HTTPXTransport
+from gql.transport.httpx import HTTPXAsyncTransport
 
-from ..config import config
+from ..config import load_config
 from ..db import supabase
 from .base import BaseWorker
 
+log = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class PHProductLink:
     type: str
     url: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PHMedia:
     type: str
     url: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PHPost:
     id: str
     name: str
@@ -105,15 +109,39 @@ class APIWorker(BaseWorker):
 
     def __init__(self):
         super().__init__()
-        transport = HTTPXTransport(
+        config = load_config()
+        transport = HTTPXAsyncTransport(
             url=config.product_hunt.api_url,
             headers={"Authorization": f"Bearer {config.product_hunt.token}"},
+            json_deserialize=orjson.loads,
+            http2=True,
         )
         self.client = Client(transport=transport, fetch_schema_from_transport=False)
+        self.session = None
+        self.loop: asyncio.AbstractEventLoop | None = None
         self.request_delay = 1.0 / config.product_hunt.requests_per_second
 
+    def setup(self):
+        """Open one GraphQL session so every page reuses the same connection."""
+        # The async session is bound to its loop, so keep one loop for the whole run
+        self.loop = asyncio.new_event_loop()
+        self.session = self.loop.run_until_complete(self.client.connect_async())
+
+    def teardown(self):
+        """Close the GraphQL session and its loop."""
+        if self.session:
+            self.loop.run_until_complete(self.client.close_async())
+            self.session = None
+        if self.loop:
+            self.loop.close()
+            self.loop = None
+
     def process_task(self, task: dict) -> None:
         """Crawl all posts for a specific day."""
+        self.loop.run_until_complete(self.process_task_async(task))
+
+    async def process_task_async(self, task: dict) -> None:
+        """Crawl all posts for a specific day (async)."""
         date_str = task['task_params']['date']
         date = datetime.fromisoformat(date_str)
 
@@ -123,27 +151,34 @@ class APIWorker(BaseWorker):
 
         cursor = None
         total_posts = 0
-
-        while True:
-            result = self.fetch_posts(posted_after, posted_before, cursor)
-            edges = result["posts"]["edges"]
-            page_info = result["posts"]["pageInfo"]
-
-            for edge in edges:
-                post = self.parse_post(edge["node"])
-                self.save_post(post)
-                self.create_task('scrape_post', post.slug, {'slug': post.slug})
-                total_posts += 1
-
-            if page_info["hasNextPage"] and page_info["endCursor"]:
-                cursor = page_info["endCursor"]
-                time.sleep(self.request_delay)
-            else:
-                break
-
-        print(f"    Fetched {total_posts} posts for {date_str}")
-
-    def fetch_posts(
+        saving: asyncio.Task | None = None
+
+        try:
+            while True:
+                result = await self.fetch_posts(posted_after, posted_before, cursor)
+                edges = result["posts"]["edges"]
+                page_info = result["posts"]["pageInfo"]
+
+                # Save the page in the background while waiting out the rate
+                # limit and fetching the next one (one save in flight at a time)
+                posts = [self.parse_post(edge["node"]) for edge in edges]
+                if saving:
+                    await saving
+                saving = asyncio.create_task(asyncio.to_thread(self.save_page, posts))
+                total_posts += len(posts)
+
+                if page_info["hasNextPage"] and page_info["endCursor"]:
+                    cursor = page_info["endCursor"]
+                    await asyncio.sleep(self.request_delay)
+                else:
+                    break
+        finally:
+            if saving:
+                await saving
+
+        log.debug("    Fetched %d posts for %s", total_posts, date_str)
+
+    async def fetch_posts(
         self,
         posted_after: str,
         posted_before: str,
@@ -156,7 +191,7 @@ class APIWorker(BaseWorker):
             "after": cursor,
             "first": 20,
         }
-        return self.client.execute(GET_POSTS_QUERY, variable_values=variables)
+        return await self.session.execute(GET_POSTS_QUERY, variable_values=variables)
 
     def parse_post(self, node: dict) -> PHPost:
         """Parse API response into PHPost."""
@@ -191,9 +226,14 @@ class APIWorker(BaseWorker):
             media=media,
         )
 
-    def save_post(self, post: PHPost):
-        """Save post to Supabase."""
-        data = {
+    def save_page(self, posts: list[PHPost]):
+        """Save a page of posts and queue their scrape tasks (one upsert each)."""
+        self.save_posts(posts)
+        self.create_tasks('scrape_post', [(post.slug, {'slug': post.slug}) for post in posts])
+
+    def post_to_row(self, post: PHPost) -> dict:
+        """Convert a post into a ph_posts row."""
+        return {
             "id": post.id,
             "name": post.name,
             "tagline": post.tagline,
@@ -211,7 +251,13 @@ class APIWorker(BaseWorker):
             "featured_at": post.featured_at,
             "created_at": post.created_at,
         }
-        supabase.table("ph_posts").upsert(data, on_conflict="id").execute()
+
+    def save_posts(self, posts: list[PHPost]):
+        """Save a batch of posts to Supabase in a single upsert."""
+        if not posts:
+            return
+        rows = [self.post_to_row(post) for post in posts]
+        supabase.table("ph_posts").upsert(rows, on_conflict="id").execute()
 
     @classmethod
     def schedule_backfill(cls, days: int) -> int:
@@ -232,7 +278,7 @@ class APIWorker(BaseWorker):
             }, on_conflict="task_type,task_key", ignore_duplicates=True).execute()
             scheduled += 1
 
-        print(f"Scheduled {scheduled} crawl_api_day tasks")
+        log.info("Scheduled %d crawl_api_day tasks", scheduled)
         return scheduled
 
     @classmethod
@@ -247,5 +293,5 @@ class APIWorker(BaseWorker):
             "status": "pending"
         }, on_conflict="task_type,task_key", ignore_duplicates=True).execute()
 
-        print(f"Scheduled crawl_api_day task for {today}")
+        log.info("Scheduled crawl_api_day task for %s", today)
         return 1
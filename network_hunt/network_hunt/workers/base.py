@@ -1,11 +1,17 @@
 """Base worker class with common task queue logic."""
 
+import logging
+import random
 import time
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 from ..db import supabase
 
+log = logging.getLogger(__name__)
+
 
 class BaseWorker(ABC):
     """Base class for all workers."""
@@ -17,14 +23,35 @@ class BaseWorker(ABC):
     max_attempts: int = 3
     max_consecutive_failures: int = 5
     processing_timeout_minutes: int = 10
+    # Tasks claimed per claim_tasks call; claimed tasks count against
+    # processing_timeout_minutes while they wait their turn, so keep it small
+    claim_batch_size: int = 5
+    # Worker threads per run(); each runs its own instance with its own setup()
+    concurrency: int = 1
+    # Completed/failed status updates are sent in batches of this size, or
+    # sooner once the oldest has waited this long; keep it well under
+    # processing_timeout_minutes so finished tasks aren't treated as stale
+    status_batch_size: int = 20
+    status_flush_seconds: float = 60.0
+    # Most recently created (task_type, task_key) pairs remembered per worker
+    created_tasks_cache_size: int = 4096
 
     # Exponential back-off
     use_backoff: bool = True
     backoff_base_seconds: float = 2.0
     backoff_max_seconds: float = 60.0
+    # Full jitter: sleep a random time up to the exponential delay, so workers
+    # failing together (e.g. rate limited) don't all retry at the same moment
+    backoff_jitter: bool = True
 
     def __init__(self):
         self.consecutive_failures = 0
+        self._status_updates: list[dict] = []
+        self._last_flush = time.monotonic()
+        # (task_type, task_key) pairs this worker already queued; re-sending
+        # them would only be an ignored duplicate upsert. Bounded LRU, since a
+        # watch() worker lives indefinitely
+        self._created_tasks: OrderedDict[tuple[str, str], None] = OrderedDict()
 
     # ========== Subclass must implement ==========
 
@@ -45,76 +72,162 @@ class BaseWorker(ABC):
 
     # ========== Common logic ==========
 
-    def run(self, limit: int = 100):
+    def run(self, limit: int = 100, concurrency: int | None = None):
         """Main entry point."""
         self.cleanup_stale_tasks()
-        tasks = self.get_pending_tasks(limit)
+        concurrency = min(concurrency or self.concurrency, limit)
+
+        if concurrency > 1:
+            # Browsers and the GraphQL session are bound to the thread that set
+            # them up, so each thread gets its own instance and a share of the
+            # limit; claim_tasks never hands the same task to two of them
+            shares = [limit // concurrency + (i < limit % concurrency) for i in range(concurrency)]
+            workers = [type(self)() for _ in shares]
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(lambda worker, share: worker.process_tasks(share), workers, shares))
+        else:
+            results = [self.process_tasks(limit)]
 
-        if not tasks:
-            print(f"No pending {self.task_type} tasks")
+        results = [r for r in results if r is not None]
+        if not results:
+            log.info("No pending %s tasks", self.task_type)
             return
 
-        print(f"Processing {len(tasks)} {self.task_type} tasks...")
+        completed = sum(c for c, _ in results)
+        failed = sum(f for _, f in results)
+        log.info("Completed: %d, Failed: %d", completed, failed)
+
+    def process_tasks(self, limit: int) -> tuple[int, int] | None:
+        """Claim and process up to `limit` tasks in turn.
 
-        self.setup()
+        Returns (completed, failed), or None if there was nothing to claim.
+        """
+        tasks = deque(self.claim_tasks(min(limit, self.claim_batch_size)))
+        if not tasks:
+            return None
+
+        log.info("Processing up to %d %s tasks...", limit, self.task_type)
+
+        claimed = len(tasks)
         completed = 0
         failed = 0
 
         try:
-            for i, task in enumerate(tasks):
-                if self.consecutive_failures >= self.max_consecutive_failures:
-                    print(f"Too many consecutive failures ({self.consecutive_failures}), stopping")
-                    break
+            self.setup()
+            while tasks and not self.should_stop():
+                if self.process_one(tasks.popleft(), completed + failed + 1):
+                    completed += 1
+                else:
+                    failed += 1
 
-                self.mark_processing(task['id'])
+                if not tasks and claimed < limit:
+                    # Send the finished batch before claiming the next one
+                    self.flush_status_updates()
+                    tasks.extend(self.claim_tasks(min(limit - claimed, self.claim_batch_size)))
+                    claimed += len(tasks)
+        finally:
+            self.finish(tasks)
 
-                try:
-                    self.process_task(task)
-                    self.mark_completed(task['id'])
-                    self.consecutive_failures = 0
-                    completed += 1
-                    print(f"  [{i+1}/{len(tasks)}] {task['task_key']}: done")
+        return completed, failed
 
-                except Exception as e:
-                    self.handle_failure(task, e)
-                    failed += 1
-                    print(f"  [{i+1}/{len(tasks)}] {task['task_key']}: error - {e}")
+    def watch(self, poll_seconds: float = 30.0):
+        """Keep claiming and processing tasks as they are queued, until interrupted.
 
-                    # Exponential back-off after failure
-                    if self.use_backoff and self.consecutive_failures < self.max_consecutive_failures:
-                        delay = self.calculate_backoff_delay(self.consecutive_failures)
-                        print(f"    Backing off for {delay:.1f}s...")
-                        time.sleep(delay)
+        setup() runs once, so the browser/session is kept between batches, and
+        an idle poll costs a single claim_tasks call.
+        """
+        self.cleanup_stale_tasks()
+        log.info("Watching for %s tasks (polling every %.0fs)...", self.task_type, poll_seconds)
+
+        tasks: deque[dict] = deque()
+        processed = 0
+
+        try:
+            self.setup()
+            while not self.should_stop():
+                if not tasks:
+                    # Don't hold finished statuses back while idle
+                    self.flush_status_updates()
+                    tasks.extend(self.claim_tasks(self.claim_batch_size))
+                    if not tasks:
+                        time.sleep(poll_seconds)
+                        continue
+
+                processed += 1
+                self.process_one(tasks.popleft(), processed)
         finally:
-            self.teardown()
+            self.finish(tasks)
+
+    def should_stop(self) -> bool:
+        """Whether too many tasks have failed in a row to keep going."""
+        if self.consecutive_failures >= self.max_consecutive_failures:
+            log.warning("Too many consecutive failures (%d), stopping", self.consecutive_failures)
+            return True
+        return False
 
-        print(f"\nCompleted: {completed}, Failed: {failed}")
+    def process_one(self, task: dict, n: int) -> bool:
+        """Process a claimed task and record the outcome. Returns True on success."""
+        try:
+            self.process_task(task)
+        except Exception as e:
+            self.handle_failure(task, e)
+            log.warning("  [%d] %s: error - %s", n, task['task_key'], e)
+
+            # Exponential back-off after failure
+            if self.use_backoff and self.consecutive_failures < self.max_consecutive_failures:
+                delay = self.calculate_backoff_delay(self.consecutive_failures)
+                log.info("    Backing off for %.1fs...", delay)
+                time.sleep(delay)
+            return False
+
+        # Outside the try: a failed batch flush here is not this task's failure
+        # (flush errors are logged and retried, never raised)
+        self.mark_completed(task['id'])
+        self.consecutive_failures = 0
+        log.debug("  [%d] %s: done", n, task['task_key'])
+        return True
+
+    def finish(self, unstarted):
+        """Release unstarted tasks, send buffered statuses and tear down."""
+        try:
+            # Hand back whatever was claimed but not started
+            self.release_tasks(unstarted)
+            if not self.flush_status_updates():
+                # Last chance: cleanup_stale_tasks re-queues these tasks later
+                log.warning("Giving up on %d status updates", len(self._status_updates))
+        finally:
+            self.teardown()
 
     def calculate_backoff_delay(self, failure_count: int) -> float:
         """Calculate exponential back-off delay."""
         delay = self.backoff_base_seconds * (2 ** (failure_count - 1))
-        return min(delay, self.backoff_max_seconds)
-
-    def get_pending_tasks(self, limit: int) -> list[dict]:
-        """Get pending tasks for this worker type."""
-        result = supabase.table("ph_tasks").select("*").eq(
-            "task_type", self.task_type
-        ).eq("status", "pending").order("created_at").limit(limit).execute()
+        delay = min(delay, self.backoff_max_seconds)
+        return random.uniform(0, delay) if self.backoff_jitter else delay
+
+    def claim_tasks(self, limit: int) -> list[dict]:
+        """Atomically mark up to `limit` pending tasks as processing and return them.
+
+        The RPC locks rows with SKIP LOCKED, so concurrent workers never claim
+        the same task.
+        """
+        result = supabase.rpc("claim_tasks", {
+            "p_task_type": self.task_type,
+            "p_limit": limit
+        }).execute()
         return result.data or []
 
-    def mark_processing(self, task_id: int):
-        """Mark task as processing."""
-        supabase.table("ph_tasks").update({
-            "status": "processing",
-            "started_at": datetime.now().isoformat()
-        }).eq("id", task_id).execute()
+    def release_tasks(self, tasks):
+        """Put claimed tasks that were never started back to pending."""
+        for task in tasks:
+            self.queue_status_update({"id": task['id'], "status": "pending"})
 
     def mark_completed(self, task_id: int):
-        """Mark task as completed."""
-        supabase.table("ph_tasks").update({
+        """Mark task as completed (sent with the next status batch)."""
+        self.queue_status_update({
+            "id": task_id,
             "status": "completed",
-            "completed_at": datetime.now().isoformat()
-        }).eq("id", task_id).execute()
+            "completed_at": datetime.now(timezone.utc).isoformat()
+        })
 
     def handle_failure(self, task: dict, error: Exception):
         """Handle task failure with retry logic."""
@@ -125,23 +238,72 @@ class BaseWorker(ABC):
         else:
             status = 'pending'  # Re-queue for retry
 
-        supabase.table("ph_tasks").update({
+        self.queue_status_update({
+            "id": task['id'],
             "status": status,
             "attempts": attempts,
             "error": str(error)[:500],  # Truncate long errors
-            "started_at": None
-        }).eq("id", task['id']).execute()
+            "error_class": type(error).__name__,
+        })
 
         self.consecutive_failures += 1
 
+    def queue_status_update(self, update: dict):
+        """Buffer a task status update, flushing once a batch is full or due."""
+        self._status_updates.append(update)
+        if (len(self._status_updates) >= self.status_batch_size
+                or time.monotonic() - self._last_flush >= self.status_flush_seconds):
+            self.flush_status_updates()
+
+    def flush_status_updates(self) -> bool:
+        """Apply all buffered status updates in a single RPC.
+
+        On failure the updates stay buffered and are retried with the next
+        flush, so one failed call doesn't end the run. Returns True if nothing
+        is left buffered.
+        """
+        if not self._status_updates:
+            return True
+        try:
+            supabase.rpc("update_ph_task_statuses", {"p": self._status_updates}).execute()
+        except Exception as e:
+            log.warning("Status update batch failed (%d kept for retry): %s", len(self._status_updates), e)
+            return False
+        finally:
+            self._last_flush = time.monotonic()
+        self._status_updates = []
+        return True
+
     def create_task(self, task_type: str, task_key: str, task_params: dict):
         """Create a downstream task only if it doesn't exist."""
-        supabase.table("ph_tasks").upsert({
-            "task_type": task_type,
-            "task_key": task_key,
-            "task_params": task_params,
-            "status": "pending"
-        }, on_conflict="task_type,task_key", ignore_duplicates=True).execute()
+        self.create_tasks(task_type, [(task_key, task_params)])
+
+    def create_tasks(self, task_type: str, tasks: list[tuple[str, dict]]):
+        """Create downstream tasks from (task_key, task_params) pairs in a single upsert.
+
+        Keys this worker has already queued are skipped without a request.
+        """
+        new_tasks = {}
+        for task_key, task_params in tasks:
+            if (task_type, task_key) in self._created_tasks:
+                self._created_tasks.move_to_end((task_type, task_key))
+            else:
+                new_tasks[task_key] = task_params
+        if not new_tasks:
+            return
+        supabase.table("ph_tasks").upsert([
+            {
+                "task_type": task_type,
+                "task_key": task_key,
+                "task_params": task_params,
+                "status": "pending"
+            }
+            for task_key, task_params in new_tasks.items()
+        ], on_conflict="task_type,task_key", ignore_duplicates=True).execute()
+        for task_key in new_tasks:
+            self._created_tasks[(task_type, task_key)] = None
+        while len(self._created_tasks) > self.created_tasks_cache_size:
+            self._created_tasks.popitem(last=False)
 
     def cleanup_stale_tasks(self):
         """Reset stale processing tasks back to pending."""
@@ -151,37 +313,14 @@ class BaseWorker(ABC):
                 "p_timeout_minutes": self.processing_timeout_minutes
             }).execute()
             if result.data and result.data > 0:
-                print(f"Reset {result.data} stale {self.task_type} tasks")
+                log.info("Reset %d stale %s tasks", result.data, self.task_type)
         except Exception as e:
-            print(f"Warning: cleanup_stale_tasks failed: {e}")
+            log.warning("cleanup_stale_tasks failed: %s", e)
 
     @classmethod
     def get_stats(cls) -> dict:
         """Get task statistics for this worker type."""
-        result = supabase.table("ph_tasks").select(
-            "status", count="exact"
-        ).eq("task_type", cls.task_type).execute()
-
-        # This doesn't work well with supabase-py, let's do it differently
-        pending = supabase.table("ph_tasks").select("id", count="exact").eq(
-            "task_type", cls.task_type
-        ).eq("status", "pending").execute()
-
-        processing = supabase.table("ph_tasks").select("id", count="exact").eq(
-            "task_type", cls.task_type
-        ).eq("status", "processing").execute()
-
-        completed = supabase.table("ph_tasks").select("id", count="exact").eq(
-            "task_type", cls.task_type
-        ).eq("status", "completed").execute()
-
-        failed = supabase.table("ph_tasks").select("id", count="exact").eq(
-            "task_type", cls.task_type
-        ).eq("status", "failed").execute()
-
-        return {
-            "pending": pending.count or 0,
-            "processing": processing.count or 0,
-            "completed": completed.count or 0,
-            "failed": failed.count or 0,
-        }
+        # One GROUP BY status query instead of a count query per status
+        result = supabase.rpc("get_task_stats", {"p_task_type": cls.task_type}).execute()
+        counts = result.data or {}
+        return {status: counts.get(status, 0) for status in ("pending", "processing", "completed", "failed")}
@@ -0,0 +1,29 @@
+"""Base class for workers that scrape Product Hunt pages in a browser."""
+
+from ..scrapers.ph_profile import PHProfileScraper, get_shared_pool
+from .base import BaseWorker
+
+
+class BrowserWorker(BaseWorker):
+    """Base class for workers that drive a PHProfileScraper."""
+
+    use_backoff = True
+    backoff_base_seconds = 5.0  # Longer backoff for web scraping
+    headless = False
+
+    def __init__(self):
+        super().__init__()
+        self.scraper: PHProfileScraper | None = None
+
+    def setup(self):
+        """Borrow a browser context from the shared pool (launched on first use)."""
+        # The pool outlives run() and is shared by every browser worker in the
+        # process, so later runs and other worker types skip the browser launch
+        self.scraper = PHProfileScraper(headless=self.headless, pool=get_shared_pool(headless=self.headless))
+        self.scraper.start()
+
+    def teardown(self):
+        """Return the context (the shared browser is closed at exit)."""
+        if self.scraper:
+            self.scraper.close()
+            self.scraper = None